@@ -5,16 +5,18 @@
 """
 
 from bleak.backends.device import BLEDevice
-from bleak.exc import BleakError
 
 from homeassistant.components.bluetooth import async_ble_device_from_address
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .const import LOGGER
+from .const import DOMAIN, LOGGER
 from .coordinator import PVCoordinator
+from .services import async_setup_services
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -23,9 +25,17 @@ PLATFORMS: list[Platform] = [
     Platform.BUTTON,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type ConfigEntryType = ConfigEntry[PVCoordinator]
 
 
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Set up the integration services."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntryType) -> bool:
     """Set up BT Battery Management System from a config entry."""
     LOGGER.debug("Setup of %s", repr(entry))
@@ -42,15 +52,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntryType) -> bool
             f"Could not find PowerView device ({entry.unique_id}) via Bluetooth"
         )
 
-    coordinator = PVCoordinator(hass, ble_device, entry.data.copy())
-    try:
-        await coordinator.query_dev_info()
-    except BleakError as err:
-        raise ConfigEntryNotReady("Unable to query device info.") from err
-
+    # entities are created from the advertised data stored by the config flow,
+    # device details are queried in the background
+    coordinator = PVCoordinator(hass, ble_device, entry)
     entry.runtime_data = coordinator
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(coordinator.async_start())
+    if coordinator.dev_info_stale:
+        coordinator.async_refresh_dev_info()
     return True
 
 
@@ -54,7 +54,7 @@ class PVBinarySensor(PassiveBluetoothCoordinatorEntity[PVCoordinator], BinarySen
         self._attr_device_info = coord.device_info
         self._attr_has_entity_name = True
         self.entity_description = descr
-        super().__init__(coord)
+        super().__init__(coord, frozenset({descr.key}))
 
     @property
     def is_on(self) -> bool | None:  # type: ignore[reportIncompatibleVariableOverride]
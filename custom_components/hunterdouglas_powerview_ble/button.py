@@ -58,7 +58,7 @@ class PowerViewButton(PassiveBluetoothCoordinatorEntity[PVCoordinator], ButtonEn
         self._attr_unique_id = (
             f"{DOMAIN}_{format_mac(self._coord.address)}_{ButtonDeviceClass.IDENTIFY}"
         )
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset())  # availability updates only
 
     @property
     def device_info(self) -> DeviceInfo:  # type: ignore[reportIncompatibleVariableOverride]
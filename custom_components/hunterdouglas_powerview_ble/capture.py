@@ -0,0 +1,169 @@
+"""Compact binary capture of shade advertisements for debugging and replay."""
+
+import asyncio
+from collections.abc import Callable, Iterator
+import mmap
+from pathlib import Path
+from struct import Struct
+import time
+from typing import Final, NamedTuple, Self
+
+# file header: magic, record size
+HEADER: Final[Struct] = Struct("<6sH")
+MAGIC: Final[bytes] = b"PVCAP1"
+# record: double timestamp, address, int8 RSSI, source adapter, V2 payload
+RECORD: Final[Struct] = Struct("<d6sb6s9s")
+PAYLOAD_SIZE: Final[int] = 9
+
+
+class CaptureRecord(NamedTuple):
+    """Single advertisement of a capture."""
+
+    timestamp: float
+    address: str
+    rssi: int
+    source: str
+    payload: bytes
+
+
+def mac_to_bytes(mac: str) -> bytes:
+    """Pack a MAC address, other names (e.g. hci0) keep 5 characters."""
+    try:
+        return bytes.fromhex(mac.replace(":", "")).rjust(6, b"\0")[-6:]
+    except ValueError:
+        return mac.encode()[:5].ljust(6, b"\0")
+
+
+def bytes_to_mac(data: bytes) -> str:
+    """Unpack an address packed by mac_to_bytes."""
+    if not data[-1] and (name := data.rstrip(b"\0")).isascii() and name.isalnum():
+        return name.decode()
+    return ":".join(f"{byte:02X}" for byte in data)
+
+
+class CaptureWriter:
+    """Append advertisements to a capture file.
+
+    Records are buffered in memory, write() does the (blocking) file I/O.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open capture file for appending, writes the header for new files."""
+        self.path: Final[Path] = path
+        self._file: Final = path.open("ab")
+        if not self._file.tell():
+            self._file.write(HEADER.pack(MAGIC, RECORD.size))
+        self._buffer: bytearray = bytearray()
+        self.records: int = 0
+
+    def append(
+        self, address: str, rssi: int, source: str, payload: bytes, stamp: float = 0
+    ) -> None:
+        """Buffer an advertisement, payloads other than V2 are truncated."""
+        self._buffer += RECORD.pack(
+            stamp or time.time(),
+            mac_to_bytes(address),
+            max(-128, min(rssi, 127)),
+            mac_to_bytes(source),
+            payload[:PAYLOAD_SIZE],
+        )
+        self.records += 1
+
+    @property
+    def pending(self) -> int:
+        """Return number of buffered bytes."""
+        return len(self._buffer)
+
+    def take(self) -> bytes:
+        """Return buffered records and clear the buffer."""
+        data: Final[bytes] = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+    def write(self, data: bytes) -> None:
+        """Write records to the file (blocking)."""
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write pending records and close the file (blocking)."""
+        self.write(self.take())
+        self._file.close()
+
+
+class CaptureReader:
+    """Memory-mapped, random access reader of a capture file."""
+
+    def __init__(self, path: Path) -> None:
+        """Map capture file."""
+        with path.open("rb") as file:
+            self._map: Final[mmap.mmap] = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        magic, size = HEADER.unpack_from(self._map)
+        if magic != MAGIC or size != RECORD.size:
+            self._map.close()
+            raise ValueError(f"{path} is not a PowerView capture")
+        self._count: Final[int] = (len(self._map) - HEADER.size) // RECORD.size
+
+    def __enter__(self) -> Self:
+        """Return reader."""
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        """Unmap file."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap file."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        """Return number of records."""
+        return self._count
+
+    def __getitem__(self, idx: int) -> CaptureRecord:
+        """Return a record without reading the records before it."""
+        if not -self._count <= idx < self._count:
+            raise IndexError("capture record index out of range")
+        stamp, address, rssi, source, payload = RECORD.unpack_from(
+            self._map, HEADER.size + (idx % self._count) * RECORD.size
+        )
+        return CaptureRecord(
+            stamp, bytes_to_mac(address), rssi, bytes_to_mac(source), payload
+        )
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        """Iterate over all records."""
+        for stamp, address, rssi, source, payload in RECORD.iter_unpack(
+            memoryview(self._map)[HEADER.size : HEADER.size + self._count * RECORD.size]
+        ):
+            yield CaptureRecord(
+                stamp, bytes_to_mac(address), rssi, bytes_to_mac(source), payload
+            )
+
+
+async def replay(
+    records: CaptureReader,
+    handler: Callable[[CaptureRecord], None],
+    speed: float = 1.0,
+) -> int:
+    """Pass records to handler with their original spacing divided by speed.
+
+    A speed of 0 replays as fast as possible, returns the number of records.
+    """
+    loop: Final = asyncio.get_running_loop()
+    start: Final[float] = loop.time()
+    first: float | None = None
+    count: int = 0
+    for record in records:
+        if first is None:
+            first = record.timestamp
+        if (
+            speed > 0
+            and (delay := start + (record.timestamp - first) / speed - loop.time()) > 0
+        ):
+            await asyncio.sleep(delay)
+        handler(record)
+        count += 1
+    return count
@@ -19,7 +19,8 @@ from homeassistant.helpers.selector import (
 )
 
 from .api import UUID_COV_SERVICE as UUID
-from .const import DOMAIN, LOGGER, MFCT_ID
+from .const import DOMAIN, LOGGER
+from .pvble.const import MFCT_ID
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
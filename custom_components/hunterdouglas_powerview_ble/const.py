@@ -3,10 +3,21 @@
 import logging
 from typing import Final
 
+from homeassistant.components.cover import ATTR_CURRENT_POSITION
+
 DOMAIN: Final[str] = "hunterdouglas_powerview_ble"
 LOGGER: Final = logging.getLogger(__package__)
-MFCT_ID: Final[int] = 2073
-TIMEOUT: Final[int] = 5
+DEV_INFO_MAX_AGE: Final[int] = 7 * 24 * 3600  # s, refresh cached device details
+DEV_INFO_RETRY: Final[int] = 300  # s, retry a failed device details query
+DEV_INFO_CHECK: Final[int] = 3600  # s, check the age of device details
+DEV_INFO_CONCURRENCY: Final[int] = 2  # shades queried for device details at once
+SLIDER_SETTLE: Final[float] = 0.5  # s, slider targets within are sent as the latest
+MOTION_REFRESH: Final[float] = 1.0  # s, state updates with estimates while moving
+WAIT_TOLERANCE: Final[float] = 1.0  # %, reached target position or tilt
+WAIT_TIMEOUT: Final[float] = 120.0  # s, waiting for a shade to reach its target
+# poll shades without advertisements for this long over GATT, 0 disables
+POLL_STALE_AFTER: Final[int] = 0  # s, e.g. 1800
+POLL_BUDGET: Final[float] = 0.02  # share of time all polls may keep shades connected
 
 # put the key here, needs to be 16 bytes long, e.g.
 # HOME_KEY: Final[bytes] = b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f"
@@ -15,3 +26,14 @@ HOME_KEY: Final[bytes] = b""
 
 # attributes (do not change)
 ATTR_RSSI: Final[str] = "rssi"
+
+# config entry data (do not change)
+CONF_DEV_DETAILS: Final[str] = "dev_details"
+CONF_DEV_DETAILS_UPDATED: Final[str] = "dev_details_updated"
+CONF_DEV_DETAILS_TYPE: Final[str] = "dev_details_type_id"
+
+# minimum change of a value before entities get updated
+DEADBANDS: Final[dict[str, float]] = {
+    ATTR_RSSI: 3,  # dBm
+    ATTR_CURRENT_POSITION: 0.5,  # %
+}
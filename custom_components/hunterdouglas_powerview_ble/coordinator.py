@@ -1,34 +1,130 @@
 """Home Assistant coordinator for Hunter Douglas PowerView (BLE) integration."""
 
-from typing import Any
+import asyncio
+from collections.abc import Mapping
+from dataclasses import dataclass
+import time
+from typing import Final
 
 from bleak.backends.device import BLEDevice
+from bleak.exc import BleakError
 
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth.const import DOMAIN as BLUETOOTH_DOMAIN
 from homeassistant.components.bluetooth.passive_update_coordinator import (
     PassiveBluetoothDataUpdateCoordinator,
 )
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH, DeviceInfo
+from homeassistant.util.hass_dict import HassKey
 
 from .api import SHADE_TYPE, PowerViewBLE
-from .const import ATTR_RSSI, DOMAIN, HOME_KEY, LOGGER
+from .capture import CaptureWriter
+from .const import (
+    CONF_DEV_DETAILS,
+    CONF_DEV_DETAILS_TYPE,
+    CONF_DEV_DETAILS_UPDATED,
+    DEADBANDS,
+    DEV_INFO_CHECK,
+    DEV_INFO_CONCURRENCY,
+    DEV_INFO_MAX_AGE,
+    DEV_INFO_RETRY,
+    DOMAIN,
+    HOME_KEY,
+    LOGGER,
+    POLL_BUDGET,
+    POLL_STALE_AFTER,
+    WAIT_TIMEOUT,
+    WAIT_TOLERANCE,
+)
+from .dispatcher import PVDispatcher
+from .poller import StalePoller
+from .pvble.advertisement import PVAdvertisement, power_level
+from .pvble.const import MFCT_ID
+from .pvble.metrics import PVAdvMetrics
+from .pvble.motion import MotionModel, SpeedTable
+from .pvble.scheduler import ConnectionScheduler
+from .pvble.waiters import TargetWaiters
+from .store import FleetStore
+
+DATA_SCHEDULER: Final[HassKey[ConnectionScheduler]] = HassKey(f"{DOMAIN}_scheduler")
+DATA_CAPTURE: Final[HassKey[CaptureWriter]] = HassKey(f"{DOMAIN}_capture")
+DATA_STORE: Final[HassKey[FleetStore]] = HassKey(f"{DOMAIN}_store")
+DATA_DEV_INFO_LIMIT: Final[HassKey[asyncio.Semaphore]] = HassKey(
+    f"{DOMAIN}_dev_info_limit"
+)
+DATA_DISPATCHER: Final[HassKey[PVDispatcher]] = HassKey(f"{DOMAIN}_dispatcher")
+DATA_SPEEDS: Final[HassKey[SpeedTable]] = HassKey(f"{DOMAIN}_speeds")
+DATA_POLLER: Final[HassKey[StalePoller]] = HassKey(f"{DOMAIN}_poller")
+
+
+@dataclass
+class PVUpdateStats:
+    """Counters of entity updates triggered by advertisements."""
+
+    emitted: int = 0
+    suppressed: int = 0
+
+
+@dataclass
+class PVInputStats:
+    """Counters of slider targets requested and sent to the shade."""
+
+    requested: int = 0
+    sent: int = 0
+
+    @property
+    def saved(self) -> int:
+        """Return number of targets coalesced into a later one."""
+        return self.requested - self.sent
 
 
 class PVCoordinator(PassiveBluetoothDataUpdateCoordinator):
     """Update coordinator for a battery management system."""
 
     def __init__(
-        self, hass: HomeAssistant, ble_device: BLEDevice, data: dict[str, Any]
+        self,
+        hass: HomeAssistant,
+        ble_device: BLEDevice,
+        entry: ConfigEntry,
+        deadbands: Mapping[str, float] = DEADBANDS,
     ) -> None:
-        """Initialize BMS data coordinator."""
+        """Initialize BMS data coordinator.
+
+        Entities are only updated if a value changes by more than its deadband.
+        Device details are restored from the config entry, if available.
+        All shades share one connection scheduler to not exceed adapter slots
+        and one columnar store, data is a view of the shade's slot.
+        """
         assert ble_device.name is not None
         self._mac = ble_device.address
-        self.api = PowerViewBLE(ble_device, HOME_KEY)
-        self.data: dict[str, int | float | bool] = {}
-        self._manuf_dat = data.get("manufacturer_data")
-        self.dev_details: dict[str, str] = {}
+        if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+            hass.data[DATA_SCHEDULER] = scheduler = ConnectionScheduler()
+        self.api = PowerViewBLE(ble_device, HOME_KEY, scheduler=scheduler)
+        if (store := hass.data.get(DATA_STORE)) is None:
+            hass.data[DATA_STORE] = store = FleetStore()
+        self._store: Final[FleetStore] = store
+        self._slot: Final[int] = self._store.add(ble_device.address)
+        self.data: Final[Mapping[str, int | float | bool]] = self._store.view(
+            self._slot
+        )
+        self.config_entry: Final[ConfigEntry] = entry
+        self._manuf_dat = entry.data.get("manufacturer_data")
+        self.dev_details: dict[str, str] = dict(entry.data.get(CONF_DEV_DETAILS, {}))
+        self._dev_info_task: asyncio.Task[None] | None = None
+        self._dev_info_retry: float = 0.0  # time.monotonic() of the next attempt
+        # time.monotonic() advertisements check the age of the details next
+        self._dev_info_check: float = time.monotonic() + DEV_INFO_CHECK
+        self._deadbands: Mapping[str, float] = deadbands
+        self.update_stats: PVUpdateStats = PVUpdateStats()
+        self.input_stats: Final[PVInputStats] = PVInputStats()
+        self.adv_metrics: Final[PVAdvMetrics] = PVAdvMetrics()
+        if (speeds := hass.data.get(DATA_SPEEDS)) is None:
+            hass.data[DATA_SPEEDS] = speeds = SpeedTable()
+        self.motion: Final[MotionModel] = MotionModel(speeds)
+        self.waiters: Final[TargetWaiters] = TargetWaiters()
 
         LOGGER.debug(
             "Initializing coordinator for %s (%s)",
@@ -39,13 +135,112 @@ class PVCoordinator(PassiveBluetoothDataUpdateCoordinator):
             hass,
             LOGGER,
             ble_device.address,
-            bluetooth.BluetoothScanningMode.ACTIVE,
+            bluetooth.BluetoothScanningMode.PASSIVE,
         )
 
     async def query_dev_info(self) -> None:
-        """Receive detailed information from device."""
+        """Receive detailed information from device and store it."""
         LOGGER.debug("%s: querying device info", self.name)
         self.dev_details.update(await self.api.query_dev_info())
+        self._async_store_dev_info()
+
+    @property
+    def type_id(self) -> int | None:
+        """Return the advertised shade type, fall back to discovery data."""
+        if (type_id := self.data.get("type_id")) is not None:
+            return int(type_id)
+        return bytes.fromhex(self._manuf_dat)[2] if self._manuf_dat else None
+
+    @property
+    def dev_info_stale(self) -> bool:
+        """Return whether stored device details need to be refreshed."""
+        entry_data: Final = self.config_entry.data
+        return (
+            not self.dev_details.get("fw_rev")
+            or entry_data.get(CONF_DEV_DETAILS_TYPE) != self.type_id
+            or time.time() - entry_data.get(CONF_DEV_DETAILS_UPDATED, 0)
+            > DEV_INFO_MAX_AGE
+        )
+
+    @callback
+    def async_refresh_dev_info(self) -> None:
+        """Refresh device details in the background.
+
+        Queries of all shades share DEV_INFO_CONCURRENCY connections, failed
+        queries are retried with the first advertisement after DEV_INFO_RETRY.
+        Advertisements check the age of the details every DEV_INFO_CHECK.
+        """
+        if self._dev_info_task is None or self._dev_info_task.done():
+            self._dev_info_retry = 0.0
+            self._dev_info_task = self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_refresh_dev_info(),
+                f"{DOMAIN} {self.name} device info",
+            )
+
+    async def _async_refresh_dev_info(self) -> None:
+        if (limit := self.hass.data.get(DATA_DEV_INFO_LIMIT)) is None:
+            self.hass.data[DATA_DEV_INFO_LIMIT] = limit = asyncio.Semaphore(
+                DEV_INFO_CONCURRENCY
+            )
+        async with limit:
+            try:
+                await self.query_dev_info()
+            except (BleakError, TimeoutError) as err:
+                self._dev_info_retry = time.monotonic() + DEV_INFO_RETRY
+                LOGGER.debug("%s: refreshing device info failed: %s", self.name, err)
+
+    async def async_poll(self) -> None:
+        """Read the battery level over GATT, the shade's advertisements are stale."""
+        level: Final[int] = await self.api.read_battery_level()
+        LOGGER.debug("%s: polled stale shade, battery %i%%", self.name, level)
+        if changed := self._store.update_battery(self._slot, power_level(level)):
+            self.async_update_listeners(changed)
+
+    async def async_wait_for_target(
+        self,
+        position: float | None = None,
+        tilt: int | None = None,
+        tolerance: float = WAIT_TOLERANCE,
+        timeout: float = WAIT_TIMEOUT,
+    ) -> PVAdvertisement:
+        """Wait until advertisements show the shade stopped at the target.
+
+        Only advertisements received after the call count. Position and tilt
+        are matched within tolerance, without both any stopped shade matches.
+        Raises TimeoutError.
+        """
+        future: Final[asyncio.Future[PVAdvertisement]] = self.waiters.add(
+            position, tilt, tolerance
+        )
+        try:
+            async with asyncio.timeout(timeout):
+                return await future
+        finally:
+            self.waiters.discard(future)
+
+    @callback
+    def _async_store_dev_info(self) -> None:
+        """Persist device details with the config entry and update registry."""
+        self.hass.config_entries.async_update_entry(
+            self.config_entry,
+            data={
+                **self.config_entry.data,
+                CONF_DEV_DETAILS: self.dev_details.copy(),
+                CONF_DEV_DETAILS_UPDATED: time.time(),
+                CONF_DEV_DETAILS_TYPE: self.type_id,
+            },
+        )
+        dev_reg: Final = dr.async_get(self.hass)
+        if device := dev_reg.async_get_device(
+            connections={(CONNECTION_BLUETOOTH, self.address)}
+        ):
+            dev_reg.async_update_device(
+                device.id,
+                serial_number=self.dev_details.get("serial_nr"),
+                sw_version=self.dev_details.get("sw_rev"),
+                hw_version=self.dev_details.get("hw_rev"),
+            )
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -79,32 +274,92 @@ class PVCoordinator(PassiveBluetoothDataUpdateCoordinator):
         """Check if a device is present."""
         return bluetooth.async_address_present(self.hass, self._mac, connectable=True)
 
+    @property
+    def home_id(self) -> int | None:
+        """Return the home ID of the discovery data."""
+        return (
+            int.from_bytes(bytes.fromhex(self._manuf_dat)[0:2], byteorder="little")
+            if self._manuf_dat
+            else None
+        )
+
+    @callback
+    def _async_start(self) -> None:
+        """Receive advertisements via the shared dispatcher, track availability."""
+        if (dispatcher := self.hass.data.get(DATA_DISPATCHER)) is None:
+            self.hass.data[DATA_DISPATCHER] = dispatcher = PVDispatcher(self.hass)
+        self._on_stop.append(dispatcher.async_register(self, self.home_id))
+        if POLL_STALE_AFTER > 0:
+            if (poller := self.hass.data.get(DATA_POLLER)) is None:
+                self.hass.data[DATA_POLLER] = poller = StalePoller(
+                    self.hass, self._store, POLL_STALE_AFTER, POLL_BUDGET
+                )
+            self._on_stop.append(poller.async_register(self))
+        self._on_stop.append(
+            bluetooth.async_track_unavailable(
+                self.hass, self._async_handle_unavailable, self.address, True
+            )
+        )
+
     def _async_stop(self) -> None:
         """Shutdown coordinator and any connection."""
         LOGGER.debug("%s: shutting down BMS device", self.name)
         self.hass.async_create_task(self.api.disconnect())
+        self.waiters.cancel()
+        self._store.remove(self._slot)
         super()._async_stop()
 
     @callback
-    def _async_handle_bluetooth_event(
+    def async_handle_advertisement(
         self,
         service_info: bluetooth.BluetoothServiceInfoBleak,
         change: bluetooth.BluetoothChange,
+        adv: PVAdvertisement | None,
     ) -> None:
-        """Handle a Bluetooth event."""
-
-        # if not self.dev_details:
-        #     self.hass.async_create_task(self._get_device_info())
-
+        """Handle a Bluetooth event with its already decoded advertisement."""
         LOGGER.debug("BLE event %s: %s", change, service_info.manufacturer_data)
-        self.data = {ATTR_RSSI: service_info.rssi}
+        if service_info.connectable:
+            self.api.rssi_history.add(
+                service_info.source, service_info.rssi, service_info.device
+            )
         if change == bluetooth.BluetoothChange.ADVERTISEMENT:
-            self.data.update(
-                self.api.dec_manufacturer_data(
-                    bytearray(service_info.manufacturer_data.get(2073, b""))
+            self.adv_metrics.adverts.tick()
+            if (capture := self.hass.data.get(DATA_CAPTURE)) is not None:
+                capture.append(
+                    service_info.address,
+                    service_info.rssi,
+                    service_info.source,
+                    service_info.manufacturer_data.get(MFCT_ID, b""),
                 )
-            )
-            self.api.encrypted = bool(self.data.get("home_id"))
+            self.api.encrypted = adv is not None and bool(adv.home_id)
+            if adv is not None:
+                self.motion.update(adv)
+                self.waiters.check(adv)
 
-        LOGGER.debug("data sample %s", self.data)
-        super()._async_handle_bluetooth_event(service_info, change)
+        changed: Final[set[str]] = self._store.update(
+            self._slot, service_info.rssi, adv, self._deadbands
+        )
+        LOGGER.debug("data sample %s, changed %s", self.data, changed)
+        now: Final[float] = time.monotonic()
+        age_check: Final[bool] = self._dev_info_check <= now
+        if age_check:
+            self._dev_info_check = now + DEV_INFO_CHECK
+        if (
+            age_check or "type_id" in changed or 0 < self._dev_info_retry <= now
+        ) and self.dev_info_stale:
+            self.async_refresh_dev_info()
+        if not self.available:
+            super()._async_handle_bluetooth_event(service_info, change)
+        elif changed:
+            self.async_update_listeners(changed)
+        else:
+            self.update_stats.suppressed += 1
+            return
+        self.update_stats.emitted += 1
+
+    @callback
+    def async_update_listeners(self, keys: set[str] | None = None) -> None:
+        """Update listeners whose context contains a changed key, None for all."""
+        for update_callback, context in list(self._listeners.values()):
+            if keys is None or context is None or not keys.isdisjoint(context):
+                update_callback()
@@ -1,5 +1,6 @@
 """Hunter Douglas Powerview cover."""
 
+from datetime import datetime, timedelta
 from typing import Any, Final
 
 from bleak.exc import BleakError
@@ -17,13 +18,29 @@ from homeassistant.components.cover import (
     CoverEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.device_registry import DeviceInfo, format_mac
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
 from .api import CLOSED_POSITION, OPEN_POSITION
-from .const import DOMAIN, HOME_KEY, LOGGER
+from .const import DOMAIN, HOME_KEY, LOGGER, MOTION_REFRESH, SLIDER_SETTLE
 from .coordinator import PVCoordinator
+from .pvble.codec import POS_UNCHANGED
+
+TILT_ONLY_TYPES: Final[frozenset[int]] = frozenset({39})
+
+# coordinator data keys that trigger a state update
+UPDATE_KEYS: Final[frozenset[str]] = frozenset(
+    {
+        ATTR_CURRENT_POSITION,
+        "is_opening",
+        "is_closing",
+        "home_id",
+        "battery_charging",
+    }
+)
 
 
 async def async_setup_entry(
@@ -34,9 +51,9 @@ async def async_setup_entry(
     """Set up the demo cover platform."""
 
     coordinator: PVCoordinator = config_entry.runtime_data
-    model: Final[str|None] = coordinator.dev_details.get("model")
     entities: list[PowerViewCover] = []
-    if model in ["39"]:
+    # type from the stored advertisement, device details may not be queried yet
+    if coordinator.type_id in TILT_ONLY_TYPES:
         entities.append(PowerViewCoverTiltOnly(coordinator))
     else:
         entities.append(PowerViewCover(coordinator))
@@ -55,6 +72,8 @@ class PowerViewCover(PassiveBluetoothCoordinatorEntity[PVCoordinator], CoverEnti
         | CoverEntityFeature.SET_POSITION
         | CoverEntityFeature.STOP
     )
+    _update_keys: frozenset[str] = UPDATE_KEYS
+    _settle: float = SLIDER_SETTLE
 
     def __init__(
         self,
@@ -68,10 +87,56 @@ class PowerViewCover(PassiveBluetoothCoordinatorEntity[PVCoordinator], CoverEnti
         self._target_position: int | None = round(
             self._coord.data.get(ATTR_CURRENT_POSITION, OPEN_POSITION)
         )
+        # latest slider targets not yet sent to the shade
+        self._pending_position: int | None = None
+        self._pending_tilt: int | None = None
+        self._debouncer: Debouncer | None = None
+        self._unsub_motion: CALLBACK_TYPE | None = None
         self._attr_unique_id = (
             f"{DOMAIN}_{format_mac(self._coord.address)}_{CoverDeviceClass.SHADE}"
         )
-        super().__init__(coordinator)
+        super().__init__(coordinator, self._update_keys)
+
+    async def async_added_to_hass(self) -> None:
+        """Set up coalescing of slider targets.
+
+        The first target is sent at once, targets within the settle window
+        after it are coalesced and only the latest is sent when it ends.
+        """
+        await super().async_added_to_hass()
+        self._debouncer = Debouncer(
+            self.hass,
+            LOGGER,
+            cooldown=self._settle,
+            immediate=True,
+            function=self._async_send_target,
+        )
+        self.async_on_remove(self._debouncer.async_shutdown)
+        self.async_on_remove(self._async_stop_motion_refresh)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data, refresh the estimated position while moving."""
+        if self._coord.motion.moving and self._unsub_motion is None:
+            self._unsub_motion = async_track_time_interval(
+                self.hass,
+                self._async_motion_refresh,
+                timedelta(seconds=MOTION_REFRESH),
+                name=f"{self._coord.name} motion refresh",
+            )
+        super()._handle_coordinator_update()
+
+    @callback
+    def _async_motion_refresh(self, _now: datetime) -> None:
+        if not self._coord.motion.moving:
+            self._async_stop_motion_refresh()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_stop_motion_refresh(self) -> None:
+        if self._unsub_motion is not None:
+            self._unsub_motion()
+            self._unsub_motion = None
 
     @property
     def device_info(self) -> DeviceInfo:  # type: ignore[reportIncompatibleVariableOverride]
@@ -117,9 +182,14 @@ class PowerViewCover(PassiveBluetoothCoordinatorEntity[PVCoordinator], CoverEnti
     def current_cover_position(self) -> int | None:  # type: ignore[reportIncompatibleVariableOverride]
         """Return current position of cover.
 
-        None is unknown, 0 is closed, 100 is fully open.
+        None is unknown, 0 is closed, 100 is fully open. While the shade moves,
+        the position is estimated from its learned speed.
         """
-        pos: Final = self._coord.data.get(ATTR_CURRENT_POSITION)
+        pos: Final = (
+            self._coord.motion.position()
+            if self._coord.motion.moving
+            else self._coord.data.get(ATTR_CURRENT_POSITION)
+        )
         return round(pos) if pos is not None else None
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
@@ -131,17 +201,64 @@ class PowerViewCover(PassiveBluetoothCoordinatorEntity[PVCoordinator], CoverEnti
                 self.is_closing or self.is_opening
             ):
                 return
-            self._target_position = round(target_position)
-            try:
-                await self._coord.api.set_position(round(target_position))
-                self.async_write_ha_state()
-            except BleakError as err:
-                LOGGER.error(
-                    "Failed to move cover '%s' to %f%%: %s",
-                    self.name,
-                    target_position,
-                    err,
-                )
+            self._target_position = self._pending_position = round(target_position)
+            self.async_write_ha_state()
+            await self._async_request_target()
+
+    async def _async_request_target(self) -> None:
+        """Send the pending targets, coalesced within the settle window."""
+        self._coord.input_stats.requested += 1
+        if self._debouncer is None:
+            await self._async_send_target()
+            return
+        await self._debouncer.async_call()
+
+    async def _async_send_target(self) -> None:
+        """Send the latest pending targets in the background.
+
+        The transaction is not awaited, so targets arriving while it runs
+        are coalesced instead of being dropped by the debouncer. A tilt
+        alone keeps the commanded position of a moving shade, not its estimate.
+        """
+        motion: Final = self._coord.motion
+        position: Final[int | None] = (
+            self._pending_position
+            if self._pending_position is not None
+            else round(motion.target)
+            if motion.moving and motion.target is not None
+            else self.current_cover_position
+        )
+        tilt: Final[int | None] = self._pending_tilt
+        self._pending_position = self._pending_tilt = None
+        if position is None:
+            return
+        self._coord.input_stats.sent += 1
+        self._coord.motion.target = position
+        self._coord.config_entry.async_create_background_task(
+            self.hass,
+            self._async_set_position(position, tilt),
+            f"{self._coord.name} set position",
+        )
+
+    async def _async_set_position(self, position: int, tilt: int | None) -> None:
+        try:
+            await self._coord.api.set_position(
+                position, tilt=POS_UNCHANGED if tilt is None else tilt
+            )
+        except (BleakError, TimeoutError) as err:
+            LOGGER.error(
+                "Failed to move cover '%s' to %i%%, tilt %s: %s",
+                self.name,
+                position,
+                tilt,
+                err,
+            )
+
+    def _cancel_pending_targets(self) -> None:
+        """Drop slider targets not sent yet, e.g. on open, close or stop."""
+        self._pending_position = self._pending_tilt = None
+        if self._debouncer is not None:
+            self._debouncer.async_cancel()
 
     def _reset_target_position(self) -> None:
         self._target_position = None
@@ -151,8 +268,10 @@ class PowerViewCover(PassiveBluetoothCoordinatorEntity[PVCoordinator], CoverEnti
         LOGGER.debug("open cover")
         if self.current_cover_position == OPEN_POSITION:
             return
+        self._cancel_pending_targets()
         try:
             self._target_position = OPEN_POSITION
+            self._coord.motion.target = OPEN_POSITION
             await self._coord.api.open()
             self.async_write_ha_state()
         except BleakError as err:
@@ -164,8 +283,10 @@ class PowerViewCover(PassiveBluetoothCoordinatorEntity[PVCoordinator], CoverEnti
         LOGGER.debug("close cover")
         if self.current_cover_position == CLOSED_POSITION:
             return
+        self._cancel_pending_targets()
         try:
             self._target_position = CLOSED_POSITION
+            self._coord.motion.target = CLOSED_POSITION
             await self._coord.api.close()
             self.async_write_ha_state()
         except BleakError as err:
@@ -175,8 +296,10 @@ class PowerViewCover(PassiveBluetoothCoordinatorEntity[PVCoordinator], CoverEnti
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
         LOGGER.debug("stop cover")
+        self._cancel_pending_targets()
         try:
             await self._coord.api.stop()
+            self._coord.motion.target = None
             self._reset_target_position()
             self.async_write_ha_state()
         except BleakError as err:
@@ -196,6 +319,7 @@ class PowerViewCoverTilt(PowerViewCover):
         | CoverEntityFeature.STOP_TILT
         | CoverEntityFeature.SET_TILT_POSITION
     )
+    _update_keys = UPDATE_KEYS | {ATTR_CURRENT_TILT_POSITION}
 
     def __init__(
         self,
@@ -224,19 +348,8 @@ class PowerViewCoverTilt(PowerViewCover):
                 or self.current_cover_position is None
             ):
                 return
-
-            try:
-                await self._coord.api.set_position(
-                    self.current_cover_position, tilt=target_position
-                )
-                self.async_write_ha_state()
-            except BleakError as err:
-                LOGGER.error(
-                    "Failed to tilt cover '%s' to %f%%: %s",
-                    self.name,
-                    target_position,
-                    err,
-                )
+            self._pending_tilt = target_position
+            await self._async_request_target()
 
     async def async_stop_cover_tilt(self, **kwargs: Any) -> None:
         """Stop the cover."""
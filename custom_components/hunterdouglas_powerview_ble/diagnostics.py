@@ -0,0 +1,85 @@
+"""Diagnostics support for Hunter Douglas PowerView (BLE)."""
+
+from dataclasses import asdict
+from typing import Any, Final
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.core import HomeAssistant
+
+from . import ConfigEntryType
+from .coordinator import (
+    DATA_DISPATCHER,
+    DATA_POLLER,
+    DATA_SCHEDULER,
+    DATA_SPEEDS,
+    DATA_STORE,
+    PVCoordinator,
+)
+
+# serial number, home ID and BLE addresses of the shades or proxies
+TO_REDACT: Final[set[str]] = {
+    "adapter",
+    "home_id",
+    "low_battery",
+    "manufacturer_data",
+    "moving",
+    "serial_nr",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntryType
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: Final[PVCoordinator] = entry.runtime_data
+    return async_redact_data(_diagnostics(hass, coordinator, entry), TO_REDACT)
+
+
+def _diagnostics(
+    hass: HomeAssistant, coordinator: PVCoordinator, entry: ConfigEntryType
+) -> dict[str, Any]:
+    return {
+        "entry_data": dict(entry.data),
+        "data": dict(coordinator.data),
+        "update_stats": asdict(coordinator.update_stats),
+        "input_stats": {
+            **asdict(coordinator.input_stats),
+            "saved": coordinator.input_stats.saved,
+        },
+        "link_stats": asdict(coordinator.api.stats),
+        "rtt": asdict(coordinator.api.rto),
+        "latency_ms": coordinator.api.metrics.as_dict(),
+        "advertisements": coordinator.adv_metrics.as_dict(),
+        "motion": coordinator.motion.as_dict(),
+        "speeds": speeds.as_dict() if (speeds := hass.data.get(DATA_SPEEDS)) else None,
+        "adapter": coordinator.api.adapter,
+        "adapter_slots": (
+            {
+                **asdict(stats),
+                "active": scheduler.active(coordinator.api.adapter),
+                "queue_depth": scheduler.queue_depth(coordinator.api.adapter),
+            }
+            if (scheduler := hass.data.get(DATA_SCHEDULER))
+            and (stats := scheduler.stats.get(coordinator.api.adapter))
+            else None
+        ),
+        "dispatcher": (
+            asdict(dispatcher.stats)
+            if (dispatcher := hass.data.get(DATA_DISPATCHER))
+            else None
+        ),
+        "poller": (
+            asdict(poller.stats) if (poller := hass.data.get(DATA_POLLER)) else None
+        ),
+        "fleet": (
+            {
+                "shades": len(store),
+                "bytes": store.nbytes,
+                "moving": store.moving(),
+                "low_battery": store.low_battery(),
+                "mean_position": store.mean_position(),
+            }
+            if (store := hass.data.get(DATA_STORE))
+            else None
+        ),
+    }
@@ -0,0 +1,137 @@
+"""Single advertisement dispatcher routing to the coordinators of all shades."""
+
+from dataclasses import dataclass
+import time
+from typing import TYPE_CHECKING, Final
+
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .api import UUID_COV_SERVICE
+from .const import LOGGER
+from .pvble.advertisement import PVAdvertisement, decode_manufacturer_data
+from .pvble.const import MFCT_ID
+
+if TYPE_CHECKING:
+    from .coordinator import PVCoordinator
+
+V2_LEN: Final[int] = 9  # length of the manufacturer data of V2 advertisements
+
+
+@dataclass
+class PVDispatchStats:
+    """Counters of the advertisement dispatcher."""
+
+    received: int = 0
+    dropped_invalid: int = 0
+    dropped_unknown: int = 0
+    dropped_foreign: int = 0
+    decoded: int = 0
+    routed: int = 0
+
+
+class PVDispatcher:
+    """Receive advertisements of all shades once and route them by address."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize dispatcher."""
+        self.hass: Final[HomeAssistant] = hass
+        self._routes: Final[dict[str, PVCoordinator]] = {}
+        self._home_ids: Final[dict[bytes, int]] = {}  # raw home ID -> shades
+        self._unsub: CALLBACK_TYPE | None = None
+        self.stats: Final[PVDispatchStats] = PVDispatchStats()
+
+    @property
+    def home_ids(self) -> set[int]:
+        """Return home IDs of the registered shades, others are foreign."""
+        return {int.from_bytes(raw, byteorder="little") for raw in self._home_ids}
+
+    def add_route(
+        self, coordinator: "PVCoordinator", home_id: int | None = None
+    ) -> CALLBACK_TYPE:
+        """Route advertisements of the coordinator's address to it.
+
+        A non-zero home_id marks the shade's home as known, once a home is
+        known, unrouted advertisements of other homes count as foreign.
+        Routed shades are never dropped for their home ID.
+        """
+        address: Final[str] = coordinator.address.upper()
+        self._routes[address] = coordinator
+        raw_id: Final[bytes | None] = (
+            home_id.to_bytes(2, byteorder="little") if home_id else None
+        )
+        if raw_id is not None:
+            self._home_ids[raw_id] = self._home_ids.get(raw_id, 0) + 1
+
+        def _remove_route() -> None:
+            if self._routes.get(address) is coordinator:
+                del self._routes[address]
+            if raw_id is not None and (count := self._home_ids.pop(raw_id, 0) - 1) > 0:
+                self._home_ids[raw_id] = count
+
+        return _remove_route
+
+    @callback
+    def async_register(
+        self, coordinator: "PVCoordinator", home_id: int | None = None
+    ) -> CALLBACK_TYPE:
+        """Add a route, the Bluetooth callback is registered with the first.
+
+        Home Assistant ignores the scanning mode of callbacks, whether shades
+        are scanned actively is set by the configuration of adapters/proxies.
+        """
+        remove_route: Final[CALLBACK_TYPE] = self.add_route(coordinator, home_id)
+        if self._unsub is None:
+            self._unsub = bluetooth.async_register_callback(
+                self.hass,
+                self.async_dispatch,
+                bluetooth.BluetoothCallbackMatcher(
+                    manufacturer_id=MFCT_ID,
+                    service_uuid=UUID_COV_SERVICE,
+                    connectable=True,
+                ),
+                bluetooth.BluetoothScanningMode.PASSIVE,
+            )
+
+        @callback
+        def _async_unregister() -> None:
+            remove_route()
+            if not self._routes and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _async_unregister
+
+    @callback
+    def async_dispatch(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        """Prefilter an advertisement, decode it and pass it to its coordinator."""
+        self.stats.received += 1
+        payload: Final[bytes | None] = service_info.manufacturer_data.get(MFCT_ID)
+        if payload is None or len(payload) != V2_LEN:
+            self.stats.dropped_invalid += 1
+            return
+        if (coordinator := self._routes.get(service_info.address.upper())) is None:
+            if (
+                self._home_ids
+                and (raw_id := payload[0:2]) not in self._home_ids
+                and any(raw_id)
+            ):
+                self.stats.dropped_foreign += 1
+                LOGGER.debug(
+                    "%s: dropping advertisement of foreign home %s",
+                    service_info.address,
+                    raw_id.hex(),
+                )
+            else:
+                self.stats.dropped_unknown += 1
+            return
+        start: Final[float] = time.perf_counter()
+        adv: Final[PVAdvertisement | None] = decode_manufacturer_data(payload)
+        coordinator.adv_metrics.decode.record(time.perf_counter() - start)
+        self.stats.decoded += 1
+        coordinator.async_handle_advertisement(service_info, change, adv)
+        self.stats.routed += 1
@@ -0,0 +1,197 @@
+"""Active polling of shades whose advertisements went stale."""
+
+from collections.abc import Hashable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import math
+import random
+import time
+from typing import TYPE_CHECKING, Final
+
+from bleak.exc import BleakError
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN, LOGGER
+from .store import FleetStore
+
+if TYPE_CHECKING:
+    from .coordinator import PVCoordinator
+
+POLL_TICK: Final[float] = 5.0  # s, resolution of the timer wheel
+WHEEL_SLOTS: Final[int] = 64  # one rotation covers 320s
+POLL_JITTER: Final[float] = 30.0  # s, spread of the first poll of a stale shade
+POLL_MAX_BACKOFF: Final[float] = 3600.0  # s, between polls of unreachable shades
+POLL_BURST: Final[float] = 60.0  # s, maximum saved airtime
+
+
+class TimerWheel[T: Hashable]:
+    """Hashed timer wheel, a tick only touches the entries of its bucket."""
+
+    def __init__(self, slots: int = WHEEL_SLOTS, tick: float = POLL_TICK) -> None:
+        """Initialize empty wheel."""
+        self._tick: Final[float] = tick
+        self._buckets: Final[list[dict[T, int]]] = [{} for _ in range(slots)]
+        self._where: Final[dict[T, int]] = {}  # key -> bucket
+        self._cursor: int = 0
+
+    def __contains__(self, key: T) -> bool:
+        """Return whether the key is scheduled."""
+        return key in self._where
+
+    def __len__(self) -> int:
+        """Return number of scheduled keys."""
+        return len(self._where)
+
+    def schedule(self, key: T, delay: float) -> None:
+        """(Re)schedule a key to be due after delay seconds, at least one tick."""
+        self.cancel(key)
+        ticks: Final[int] = max(1, math.ceil(delay / self._tick))
+        bucket: Final[int] = (self._cursor + ticks) % len(self._buckets)
+        self._buckets[bucket][key] = (ticks - 1) // len(self._buckets)  # rotations
+        self._where[key] = bucket
+
+    def cancel(self, key: T) -> None:
+        """Remove a key if it is scheduled."""
+        if (bucket := self._where.pop(key, None)) is not None:
+            del self._buckets[bucket][key]
+
+    def advance(self) -> list[T]:
+        """Advance by one tick and return the keys that became due."""
+        self._cursor = (self._cursor + 1) % len(self._buckets)
+        bucket: Final[dict[T, int]] = self._buckets[self._cursor]
+        due: Final[list[T]] = []
+        for key, rotations in list(bucket.items()):
+            if rotations:
+                bucket[key] = rotations - 1
+                continue
+            del bucket[key]
+            del self._where[key]
+            due.append(key)
+        return due
+
+
+@dataclass
+class PVPollStats:
+    """Counters of the stale shade poller."""
+
+    scheduled: int = 0
+    polled: int = 0
+    failed: int = 0
+    skipped_fresh: int = 0
+    deferred_budget: int = 0
+    airtime: float = 0.0  # s, connection time spent on polls
+
+
+class StalePoller:
+    """Poll shades without recent advertisements over GATT.
+
+    A single timer wheel holds the shades that are due, fresh shades are
+    never polled. Polls of all shades share an airtime budget, a fraction
+    of the time that may be spent connected, and unreachable shades are
+    polled with exponential backoff.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, store: FleetStore, stale_after: float, budget: float
+    ) -> None:
+        """Initialize poller, stale_after and budget are fleet-wide."""
+        self.hass: Final[HomeAssistant] = hass
+        self._store: Final[FleetStore] = store
+        self._stale_after: Final[float] = stale_after
+        self._budget: Final[float] = budget
+        self._coordinators: Final[dict[str, PVCoordinator]] = {}
+        self._registered: Final[dict[str, float]] = {}  # address -> time.monotonic()
+        self._backoff: Final[dict[str, float]] = {}
+        self._polling: Final[set[str]] = set()
+        self._wheel: Final[TimerWheel[str]] = TimerWheel()
+        self._airtime: float = 0.0  # s, saved budget
+        self._unsub: CALLBACK_TYPE | None = None
+        self.stats: Final[PVPollStats] = PVPollStats()
+
+    @callback
+    def async_register(self, coordinator: "PVCoordinator") -> CALLBACK_TYPE:
+        """Watch a shade, the shared tick is started with the first."""
+        address: Final[str] = coordinator.address
+        self._coordinators[address] = coordinator
+        self._registered[address] = time.monotonic()
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass,
+                self._async_tick,
+                timedelta(seconds=POLL_TICK),
+                name=f"{DOMAIN} stale poller",
+            )
+
+        @callback
+        def _async_unregister() -> None:
+            if self._coordinators.get(address) is coordinator:
+                del self._coordinators[address]
+                self._registered.pop(address, None)
+                self._backoff.pop(address, None)
+                self._wheel.cancel(address)
+            if not self._coordinators and self._unsub is not None:
+                self._unsub()
+                self._unsub = None
+
+        return _async_unregister
+
+    def _stale(self, address: str, now: float) -> bool:
+        """Return whether a shade has not advertised since it was registered."""
+        return (
+            address in self._coordinators
+            and now - self._registered[address] >= self._stale_after
+            and (slot := self._store.slot(address)) is not None
+            and now - self._store.last_seen[slot] >= self._stale_after
+        )
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        now: Final[float] = time.monotonic()
+        self._airtime = min(self._airtime + POLL_TICK * self._budget, POLL_BURST)
+        for address in self._store.stale(self._stale_after, now):
+            if (
+                address not in self._wheel
+                and address not in self._polling
+                and self._stale(address, now)
+            ):
+                self._wheel.schedule(address, random.uniform(0, POLL_JITTER))
+                self.stats.scheduled += 1
+        for address in self._wheel.advance():
+            if not self._stale(address, now):
+                self._backoff.pop(address, None)
+                self.stats.skipped_fresh += 1
+            elif self._airtime <= 0:
+                self._wheel.schedule(address, random.uniform(POLL_TICK, POLL_JITTER))
+                self.stats.deferred_budget += 1
+            else:
+                self._polling.add(address)
+                self._coordinators[address].config_entry.async_create_background_task(
+                    self.hass,
+                    self._async_poll(self._coordinators[address]),
+                    f"{DOMAIN} {address} poll",
+                )
+
+    async def _async_poll(self, coordinator: "PVCoordinator") -> None:
+        address: Final[str] = coordinator.address
+        start: Final[float] = time.monotonic()
+        backoff: float = self._stale_after
+        try:
+            await coordinator.async_poll()
+        except (BleakError, TimeoutError, IndexError, ValueError) as err:
+            # IndexError, ValueError: empty or malformed GATT read
+            self.stats.failed += 1
+            backoff = min(
+                2 * self._backoff.get(address, self._stale_after / 2), POLL_MAX_BACKOFF
+            )
+            LOGGER.debug("%s: poll failed, next in %.0fs: %s", address, backoff, err)
+        finally:
+            self._polling.discard(address)
+            duration: Final[float] = time.monotonic() - start
+            self._airtime -= duration
+            self.stats.airtime += duration
+            self.stats.polled += 1
+            self._backoff[address] = backoff
+            if address in self._coordinators:
+                self._wheel.schedule(address, backoff + random.uniform(0, POLL_JITTER))
@@ -0,0 +1,52 @@
+"""Hunter Douglas PowerView BLE protocol library without Home Assistant.
+
+Public names are loaded on first access, bleak and cryptography are only
+imported once a connection is made or a frame is encrypted.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from .advertisement import PVAdvertisement, decode_manufacturer_data
+    from .api import SHADE_TYPE, PowerViewBLE
+    from .codec import ShadeCmd
+    from .crypto import PVCipher
+    from .motion import MotionModel, SpeedTable
+    from .scheduler import ConnectionScheduler
+    from .waiters import TargetWaiters
+
+_EXPORTS: Final[dict[str, str]] = {
+    "ConnectionScheduler": "scheduler",
+    "MotionModel": "motion",
+    "PVAdvertisement": "advertisement",
+    "PVCipher": "crypto",
+    "PowerViewBLE": "api",
+    "SHADE_TYPE": "api",
+    "SpeedTable": "motion",
+    "TargetWaiters": "waiters",
+    "ShadeCmd": "codec",
+    "decode_manufacturer_data": "advertisement",
+}
+
+__all__ = [
+    "SHADE_TYPE",
+    "ConnectionScheduler",
+    "MotionModel",
+    "PVAdvertisement",
+    "PVCipher",
+    "PowerViewBLE",
+    "ShadeCmd",
+    "SpeedTable",
+    "TargetWaiters",
+    "decode_manufacturer_data",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule of a public name on first access."""
+    if (module := _EXPORTS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value: Final = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
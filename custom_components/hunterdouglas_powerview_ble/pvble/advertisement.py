@@ -0,0 +1,85 @@
+"""Decoder for Hunter Douglas PowerView BLE advertisements."""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Final
+
+from .const import ATTR_CURRENT_POSITION, ATTR_CURRENT_TILT_POSITION, LOGGER
+
+ADV_CACHE_SIZE: Final[int] = 512  # distinct payloads, e.g. positions of all shades
+
+POWER_LEVELS: Final[dict[int, int]] = {
+    4: 100,  # 4 is hardwired
+    3: 100,  # 3 = 100% to 51% power remaining
+    2: 50,  # 2 = 50% to 21% power remaining
+    1: 20,  # 1 = 20% or less power remaining
+    0: 0,  # 0 = No power remaining
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PVAdvertisement:
+    """Decoded manufacturer data of a V2 advertisement."""
+
+    current_position: float
+    position2: int
+    position3: int
+    current_tilt_position: int
+    home_id: int
+    type_id: int
+    is_opening: bool
+    is_closing: bool
+    battery_charging: bool
+    battery_level: int
+    reset_mode: bool
+    reset_clock: bool
+
+    def as_dict(self) -> dict[str, int | float | bool]:
+        """Return the advertised values as coordinator data."""
+        return {
+            ATTR_CURRENT_POSITION: self.current_position,
+            "position2": self.position2,
+            "position3": self.position3,
+            ATTR_CURRENT_TILT_POSITION: self.current_tilt_position,
+            "home_id": self.home_id,
+            "type_id": self.type_id,
+            "is_opening": self.is_opening,
+            "is_closing": self.is_closing,
+            "battery_charging": self.battery_charging,
+            "battery_level": self.battery_level,
+            "resetMode": self.reset_mode,
+            "resetClock": self.reset_clock,
+        }
+
+
+def power_level(percent: int) -> int:
+    """Return the advertised battery level of a percentage, e.g. read via GATT."""
+    return min((lvl for lvl in POWER_LEVELS.values() if lvl >= percent), default=100)
+
+
+@lru_cache(maxsize=ADV_CACHE_SIZE)
+def decode_manufacturer_data(data: bytes) -> PVAdvertisement | None:
+    """Decode manufacturer data from BLE advertisement V2.
+
+    Shades repeat identical payloads, so results are cached by the raw
+    bytes, see decode_manufacturer_data.cache_info() for hits and misses.
+    """
+    if len(data) != 9:
+        LOGGER.debug("not a V2 record!")
+        return None
+    pos: Final[int] = int.from_bytes(data[3:5], byteorder="little")
+    pos2: Final[int] = (data[5] << 4) + (data[4] >> 4)
+    return PVAdvertisement(
+        current_position=(pos >> 2) / 10,
+        position2=pos2 >> 2,
+        position3=data[6],
+        current_tilt_position=data[7],
+        home_id=int.from_bytes(data[0:2], byteorder="little"),
+        type_id=data[2],
+        is_opening=pos & 0x3 == 0x2,
+        is_closing=pos & 0x3 == 0x1,
+        battery_charging=pos & 0x3 == 0x3,  # observed
+        battery_level=POWER_LEVELS[data[8] >> 6],  # cannot hit 4
+        reset_mode=bool(data[8] & 0x1),
+        reset_clock=bool(data[8] & 0x2),
+    )
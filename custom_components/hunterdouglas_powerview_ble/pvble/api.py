@@ -0,0 +1,713 @@
+"""Hunter Douglas PowerView BLE API.
+
+bleak and bleak-retry-connector are imported on first use, so that tools
+decoding or encoding frames do not pay for them.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import time
+from typing import TYPE_CHECKING, Final
+
+from .advertisement import PVAdvertisement, decode_manufacturer_data
+from .codec import (
+    CLOSE_FRAME,
+    OPEN_FRAME,
+    POS_UNCHANGED,
+    RESPONSE,
+    RESPONSE_MASK,
+    SEQ_OFFSET,
+    STOP_FRAME,
+    PVResponse,
+    ShadeCmd,
+    decode_response,
+    encode_identify,
+    encode_position,
+    encode_scene,
+    set_seq,
+)
+from .const import IDLE_TIMEOUT, LOGGER, MAX_IN_FLIGHT, TIMEOUT
+from .crypto import PVCipher
+from .metrics import PVLinkMetrics
+from .routing import RssiHistory
+from .rto import RtoEstimator
+from .scheduler import ConnectionScheduler, ConnectionSlot, ConnPriority, adapter_of
+
+if TYPE_CHECKING:
+    from bleak import BleakClient
+    from bleak.backends.device import BLEDevice
+
+
+def _uuid(short: str) -> str:
+    """Return the 128-bit UUID of a 16-bit Bluetooth SIG UUID."""
+    return f"0000{short}-0000-1000-8000-00805f9b34fb"
+
+
+UUID_COV_SERVICE: Final[str] = _uuid("fdc1")
+UUID_TX: Final[str] = "cafe1001-c0ff-ee01-8000-a110ca7ab1e0"
+UUID_DEV_SERVICE: Final[str] = _uuid("180a")
+UUID_BAT_SERVICE: Final[str] = _uuid("180f")
+UUID_BAT_LEVEL: Final[str] = _uuid("2a19")
+
+ATTR_ACTIVITY: Final[str] = "activity"
+
+
+SHADE_TYPE: Final[dict[int, str]] = {
+    # up down only
+    1: "Designer Roller",
+    4: "Roman",
+    5: "Bottom Up",
+    6: "Duette",
+    10: "Duette and Applause SkyLift",
+    19: "Provenance Woven Wood",
+    31: "Vignette",
+    32: "Vignette",
+    42: "M25T Roller Blind",
+    49: "AC Roller",
+    52: "Banded Shades",
+    53: "Sonnette",
+    84: "Vignette",
+    # top down bottom up
+    8: "Duette, Top Down Bottom Up",
+    9: "Duette DuoLite, Top Down Bottom Up",
+    33: "Duette Architella, Top Down Bottom Up",
+    39: "Parkland",
+    47: "Pleated, Top Down Bottom Up",
+    # top down, tilt anywhere
+    51: "Venetian, Tilt Anywhere",
+    62: "Venetian, Tilt Anywhere",
+}
+
+FAILOVER_ATTEMPTS: Final[int] = 2  # connect attempts before trying the next adapter
+MAX_RETRANSMITS: Final[int] = 2  # repeated frames before giving up on a response
+
+OPEN_POSITION: Final[int] = 100
+CLOSED_POSITION: Final[int] = 0
+
+
+@dataclass
+class _PendingCmd:
+    """Queued command and the callers waiting for its outcome."""
+
+    cmd: ShadeCmd
+    frame: bytearray
+    disconnect: bool
+    waiters: list[asyncio.Future[bool]] = field(default_factory=list)
+
+
+@dataclass
+class PVLinkStats:
+    """Counters of the command link to a shade."""
+
+    late_responses: int = 0
+    duplicate_responses: int = 0
+    frames_sent: int = 0
+    retransmits: int = 0
+    acknowledged: int = 0
+    timeouts: int = 0
+
+
+@dataclass
+class PVDeviceInfo:
+    """Dataclass holding available PowerView device information."""
+
+    manufacturer: str = ""
+    model: str = ""
+    serial_nr: str = ""
+    hw_rev: str = ""
+    fw_rev: str = ""
+    sw_rev: str = ""
+    battery_level: int = 0
+
+
+class PowerViewBLE:
+    """Class to handle connection to PowerView remote device."""
+
+    def __init__(
+        self,
+        ble_device: "BLEDevice",
+        home_key: bytes = b"",
+        idle_timeout: float = IDLE_TIMEOUT,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        scheduler: ConnectionScheduler | None = None,
+        client_class: "type[BleakClient] | None" = None,
+    ) -> None:
+        """Initialize device API via Bluetooth.
+
+        The connection is kept open for idle_timeout seconds after the last
+        command, a value of 0 disconnects right after each command. Up to
+        max_in_flight frames are sent without waiting for their response.
+        Connections are requested from the scheduler shared by all shades and
+        made via the adapter with the best RSSI in rssi_history. The
+        client_class is passed to establish_connection, e.g. for emulators,
+        it defaults to BleakClient.
+        """
+        if client_class is None:
+            from bleak import BleakClient  # noqa: PLC0415
+
+            client_class = BleakClient
+        self._ble_device: BLEDevice = ble_device
+        self.name: Final[str] = self._ble_device.name or "unknown"
+        self._seqcnt: int = 0
+        self._client_class: Final[type[BleakClient]] = client_class
+        self._client: BleakClient = client_class(
+            self._ble_device,
+            disconnected_callback=self._on_disconnect,
+            services=[
+                UUID_COV_SERVICE,
+                UUID_DEV_SERVICE,
+                UUID_BAT_SERVICE,
+            ],
+        )
+        self._in_flight: Final[dict[int, asyncio.Future[bytes]]] = {}
+        self._answered: Final[deque[int]] = deque(maxlen=8)
+        self._in_flight_slots: Final = asyncio.Semaphore(max_in_flight)
+        self._cmd_tasks: Final[set[asyncio.Task[None]]] = set()
+        self.stats: Final[PVLinkStats] = PVLinkStats()
+        self.rto: Final[RtoEstimator] = RtoEstimator()
+        self.metrics: Final[PVLinkMetrics] = PVLinkMetrics()
+        self._info: PVDeviceInfo = PVDeviceInfo()
+        self._is_encrypted: bool = False
+        self._cmd_lock: Final = asyncio.Lock()
+        self._cmd_queue: Final[deque[_PendingCmd]] = deque()
+        self._cmd_worker: asyncio.Task[None] | None = None
+        self._idle_timeout: Final[float] = idle_timeout
+        self._idle_timer: asyncio.TimerHandle | None = None
+        self._idle_task: asyncio.Task[None] | None = None
+        self._scheduler: Final[ConnectionScheduler] = (
+            scheduler if scheduler is not None else ConnectionScheduler()
+        )
+        self._slot: ConnectionSlot | None = None
+        self.rssi_history: Final[RssiHistory] = RssiHistory()
+        self._cipher: Final[PVCipher | None] = (
+            PVCipher(home_key) if len(home_key) == 16 else None
+        )
+
+    @property
+    def encrypted(self) -> bool:
+        """Return whether communication with this shade is encrypted."""
+        return self._is_encrypted
+
+    @encrypted.setter
+    def encrypted(self, value: bool) -> None:
+        self._is_encrypted = value
+
+    @property
+    def info(self) -> PVDeviceInfo:
+        """Return device information, e.g. SW version."""
+        return self._info
+
+    @property
+    def is_connected(self) -> bool:
+        """Return whether remote device is connected."""
+        return self._client.is_connected
+
+    @property
+    def adapter(self) -> str:
+        """Return the adapter the device is connected by."""
+        return adapter_of(self._ble_device)
+
+    @property
+    def next_adapter(self) -> str:
+        """Return the adapter the next command is sent by, as chosen by _connect."""
+        if self.is_connected:
+            return self.adapter
+        return adapter_of((self.rssi_history.ranked() or [self._ble_device])[0])
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self._slot is not None:
+            self._slot.set_idle(False)
+
+    def _release_slot(self) -> None:
+        if self._slot is not None:
+            self._slot.release()
+            self._slot = None
+
+    async def _release_connection(self, keep: bool = False) -> None:
+        """Close the connection now or once it has been idle long enough.
+
+        With keep, the connection stays open for a follow-up command even
+        if idle_timeout is 0, until the default idle timeout expired.
+        """
+        if self._idle_timeout <= 0 and not keep:
+            await self.disconnect()
+            return
+
+        self._cancel_idle_timer()
+        if self.is_connected:
+            self._idle_timer = asyncio.get_running_loop().call_later(
+                self._idle_timeout if self._idle_timeout > 0 else IDLE_TIMEOUT,
+                self._on_idle_timeout,
+            )
+            if self._slot is not None:
+                self._slot.set_idle(True)  # preempted if other shades wait
+        else:
+            self._release_slot()  # lost connection, hand the slot on now
+
+    def _on_idle_timeout(self) -> None:
+        """Disconnect after the connection has been idle for idle_timeout."""
+        self._idle_timer = None
+        if self._cmd_lock.locked() or self._in_flight:
+            return  # running command re-arms the timer when done
+        LOGGER.debug("%s: connection idle for %.1fs", self.name, self._idle_timeout)
+        self._idle_task = asyncio.get_running_loop().create_task(self.disconnect())
+
+    def _on_preempt(self) -> None:
+        """Close idle connection early, other shades wait for the adapter."""
+        self._cancel_idle_timer()
+        self._on_idle_timeout()
+
+    @asynccontextmanager
+    async def _locked(self) -> AsyncIterator[None]:
+        """Hold the command lock, keep the connection and record the wait."""
+        start: Final[float] = time.monotonic()
+        async with self._cmd_lock:
+            self.metrics.lock_wait.record(time.monotonic() - start)
+            self._cancel_idle_timer()
+            yield
+
+    async def _cmd(
+        self, cmd: ShadeCmd, frame: bytearray, disconnect: bool = True
+    ) -> bool:
+        """Queue a command and wait for the outcome of the frame carrying it."""
+        loop: Final = asyncio.get_running_loop()
+        start: Final[float] = time.monotonic()
+        waiter: Final[asyncio.Future[bool]] = loop.create_future()
+        self._enqueue(_PendingCmd(cmd, frame, disconnect, [waiter]))
+        if self._cmd_worker is None or self._cmd_worker.done():
+            self._cmd_worker = loop.create_task(self._process_queue())
+        else:
+            LOGGER.debug("%s: device busy, queuing %s command", self.name, cmd)
+        try:
+            return await waiter
+        finally:
+            self.metrics.command.record(time.monotonic() - start)
+
+    def _enqueue(self, entry: _PendingCmd) -> None:
+        """Add command to queue, merging superseded ones and prioritizing stop.
+
+        A stop drops queued position commands, their callers get False.
+        """
+        if entry.cmd in (ShadeCmd.SET_POSITION, ShadeCmd.STOP):
+            superseded: Final[list[_PendingCmd]] = [
+                queued for queued in self._cmd_queue if queued.cmd == entry.cmd
+            ]
+            if superseded:
+                LOGGER.debug(
+                    "%s: merging %i queued %s command(s)",
+                    self.name,
+                    len(superseded),
+                    entry.cmd,
+                )
+                for queued in superseded:
+                    entry.waiters.extend(queued.waiters)
+                # newest command takes the place of the oldest superseded one
+                self._cmd_queue[self._cmd_queue.index(superseded[0])] = entry
+                for queued in superseded[1:]:
+                    self._cmd_queue.remove(queued)
+                return
+
+        if entry.cmd == ShadeCmd.STOP:
+            # queued moves would start the shade again after it stopped
+            for queued in [
+                queued
+                for queued in self._cmd_queue
+                if queued.cmd == ShadeCmd.SET_POSITION
+            ]:
+                LOGGER.debug("%s: stop drops queued %s", self.name, queued.cmd)
+                self._cmd_queue.remove(queued)
+                for waiter in queued.waiters:
+                    if not waiter.done():
+                        waiter.set_result(False)
+            self._cmd_queue.appendleft(entry)
+        else:
+            self._cmd_queue.append(entry)
+
+    async def _process_queue(self) -> None:
+        """Send queued commands, keeping up to max_in_flight frames pending."""
+        loop: Final = asyncio.get_running_loop()
+        while True:
+            # wait for a free slot first, so queued commands can still be merged
+            await self._in_flight_slots.acquire()
+            if not self._cmd_queue:
+                self._in_flight_slots.release()
+                return
+            entry: _PendingCmd = self._cmd_queue.popleft()
+            waiters: list[asyncio.Future[bool]] = [
+                waiter for waiter in entry.waiters if not waiter.done()
+            ]
+            if not waiters:
+                self._in_flight_slots.release()
+                continue  # all callers gave up
+            task: asyncio.Task[None] = loop.create_task(self._run_cmd(entry, waiters))
+            self._cmd_tasks.add(task)
+            task.add_done_callback(self._cmd_tasks.discard)
+
+    async def _run_cmd(
+        self, entry: _PendingCmd, waiters: list[asyncio.Future[bool]]
+    ) -> None:
+        """Send a command and report the result to all waiting callers."""
+        try:
+            result: bool = await self._send_cmd(entry)
+        except Exception as ex:  # noqa: BLE001
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(ex)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(result)
+        finally:
+            self._in_flight_slots.release()
+
+    def _alloc_seq(self) -> int:
+        """Return the next 8-bit sequence ID that is not in flight."""
+        for _ in range(0xFF):
+            self._seqcnt = self._seqcnt % 0xFF + 1  # 1..255, wraps around
+            if self._seqcnt not in self._in_flight:
+                if self._seqcnt in self._answered:
+                    self._answered.remove(self._seqcnt)
+                return self._seqcnt
+        raise RuntimeError("No free sequence ID available.")
+
+    async def _send_cmd(self, cmd_run: _PendingCmd) -> bool:
+        """Send a frame and wait for the response with matching sequence ID."""
+        async with self._locked():
+            seq_nr: int = 0
+            try:
+                await self._connect(
+                    ConnPriority.STOP
+                    if cmd_run.cmd == ShadeCmd.STOP
+                    else ConnPriority.USER
+                )
+                seq_nr = self._alloc_seq()
+                set_seq(cmd_run.frame, seq_nr)
+                tx_data: bytes = bytes(cmd_run.frame)
+                LOGGER.debug("sending cmd: %s", tx_data.hex(" "))
+                if self._cipher is not None and self._is_encrypted:
+                    tx_data = self._cipher.encrypt(tx_data)
+                    LOGGER.debug("  encrypted: %s", tx_data.hex(" "))
+                response: asyncio.Future[bytes] = (
+                    asyncio.get_running_loop().create_future()
+                )
+                self._in_flight[seq_nr] = response
+                await self._client.write_gatt_char(UUID_TX, tx_data, False)
+                self.stats.frames_sent += 1
+            except Exception as ex:
+                self._in_flight.pop(seq_nr, None)
+                LOGGER.error("Error: %s - %s", type(ex).__name__, ex)
+                if not self._in_flight:
+                    await self._release_connection(keep=not cmd_run.disconnect)
+                raise
+
+        # wait outside of the lock to allow further frames to be sent
+        LOGGER.debug("waiting for response #%i", seq_nr)
+        sent: Final[float] = time.monotonic()
+        timeout: float = self.rto.rto
+        try:
+            for retransmits in range(MAX_RETRANSMITS + 1):
+                if (await asyncio.wait((response,), timeout=timeout))[0]:
+                    break
+                remaining: float = sent + TIMEOUT - time.monotonic()
+                if retransmits == MAX_RETRANSMITS or remaining <= 0:
+                    self.stats.timeouts += 1
+                    LOGGER.error("%s: no confirmation for #%i", self.name, seq_nr)
+                    raise TimeoutError("Device did not send confirmation.")
+                timeout = min(self.rto.backoff(), remaining)
+                await self._retransmit(seq_nr, tx_data)
+            rtt: Final[float] = time.monotonic() - sent
+            self.metrics.write_ack.record(rtt)
+            if not retransmits:  # Karn: responses to repeated frames are ambiguous
+                self.rto.sample(rtt)
+            self.stats.acknowledged += 1
+            return self._verify_response(response.result(), seq_nr, cmd_run.cmd)
+        finally:
+            if self._in_flight.pop(seq_nr).done():
+                self._answered.append(seq_nr)
+            if not self._in_flight:
+                await self._release_connection(keep=not cmd_run.disconnect)
+
+    async def _retransmit(self, seq_nr: int, tx_data: bytes) -> None:
+        """Repeat an unanswered frame with its original sequence ID."""
+        async with self._locked():
+            await self._connect()
+            LOGGER.debug(
+                "%s: no response to #%i within %.2fs, retransmitting",
+                self.name,
+                seq_nr,
+                self.rto.rto,
+            )
+            await self._client.write_gatt_char(UUID_TX, tx_data, False)
+            self.stats.frames_sent += 1
+            self.stats.retransmits += 1
+
+    @staticmethod
+    def dec_manufacturer_data(
+        data: bytes | bytearray | memoryview,
+    ) -> PVAdvertisement | None:
+        """Decode manufacturer data from BLE advertisement V2."""
+        return decode_manufacturer_data(bytes(data))  # cached, needs hashable data
+
+    async def set_position(
+        self,
+        pos1: int,
+        pos2: int = POS_UNCHANGED,
+        pos3: int = POS_UNCHANGED,
+        tilt: int = POS_UNCHANGED,
+        velocity: int = 0x0,
+        disconnect: bool = True,
+    ) -> bool:
+        """Set position of device, return whether the shade confirmed it."""
+        LOGGER.debug(
+            "%s setting position to %i/%i/%i, tilt %i, velocity %s",
+            self.name,
+            pos1,
+            pos2,
+            pos3,
+            tilt,
+            velocity,
+        )
+        return await self._cmd(
+            ShadeCmd.SET_POSITION,
+            encode_position(pos1 * 100, pos2, pos3, tilt, velocity),
+            disconnect,
+        )
+
+    async def open(self) -> bool:
+        """Fully open cover."""
+        LOGGER.debug("%s open", self.name)
+        return await self._cmd(
+            ShadeCmd.SET_POSITION, bytearray(OPEN_FRAME), disconnect=False
+        )
+
+    async def stop(self) -> bool:
+        """Stop device movement."""
+        LOGGER.debug("%s stop", self.name)
+        return await self._cmd(ShadeCmd.STOP, bytearray(STOP_FRAME))
+
+    async def close(self) -> bool:
+        """Fully close cover."""
+        LOGGER.debug("%s close", self.name)
+        return await self._cmd(
+            ShadeCmd.SET_POSITION, bytearray(CLOSE_FRAME), disconnect=False
+        )
+
+    # open: scene 2
+    # close: scene 3
+    async def activate_scene(self, idx: int) -> bool:
+        """Activate stored scene."""
+        LOGGER.debug("%s set scene #%i", self.name, idx)
+        return await self._cmd(ShadeCmd.ACTIVATE_SCENE, encode_scene(idx))
+
+    async def identify(self, beeps: int = 0x3) -> bool:
+        """Identify device."""
+        LOGGER.debug("%s identify (%i)", self.name, beeps)
+        return await self._cmd(ShadeCmd.IDENTIFY, encode_identify(beeps))
+
+    def _verify_response(self, data: bytes, seq_nr: int, cmd: ShadeCmd) -> bool:
+        """Verify shade response data."""
+        if len(data) < RESPONSE.size:
+            LOGGER.error("Response message too short")
+            return False
+        resp: Final[PVResponse] = decode_response(data)
+        if resp.cmd != cmd.value & RESPONSE_MASK:
+            LOGGER.warning("Response to wrong command")
+            return False
+        if resp.seq_nr != seq_nr:
+            LOGGER.warning(
+                "Response sequence id %i wrong, expected %d", resp.seq_nr, seq_nr
+            )
+            return False
+        if resp.data_len != 1:
+            LOGGER.error("Wrong response data length")
+            return False
+        if resp.error != 0:
+            LOGGER.error("Command %X returned error #%d", cmd.value, resp.error)
+            return False
+        return True
+
+    async def query_dev_info(self) -> dict[str, str]:
+        """Return detailed device information."""
+        data: dict[str, str] = {}
+        uuids: Final[dict[str, str]] = {
+            "manufacturer": "2a29",
+            "model": "2a24",
+            "serial_nr": "2a25",
+            "hw_rev": "2a27",
+            "fw_rev": "2a26",
+            "sw_rev": "2a28",
+        }
+
+        from bleak.exc import BleakError  # noqa: PLC0415
+
+        async with self._locked():
+            try:
+                await self._connect(ConnPriority.QUERY)
+
+                for key, uuid in uuids.items():
+                    LOGGER.debug("querying %s(%s)", key, uuid)
+                    data[key] = (
+                        (await self._client.read_gatt_char(_uuid(uuid)))
+                        .copy()
+                        .decode("UTF-8")
+                    )
+            except BleakError as ex:
+                LOGGER.debug("%s: querying failed: %s", self.name, ex)
+                raise
+            finally:
+                await self._release_connection()
+        LOGGER.debug("%s device data: %s", self.name, data)
+        return data.copy()
+
+    async def read_battery_level(self) -> int:
+        """Return the battery level in % read from the battery service."""
+
+        from bleak.exc import BleakError  # noqa: PLC0415
+
+        async with self._locked():
+            try:
+                await self._connect(ConnPriority.POLL)
+                data: Final[bytearray] = await self._client.read_gatt_char(
+                    UUID_BAT_LEVEL
+                )
+            except BleakError as ex:
+                LOGGER.debug("%s: reading battery level failed: %s", self.name, ex)
+                raise
+            finally:
+                await self._release_connection()
+        LOGGER.debug("%s battery level: %i%%", self.name, data[0])
+        self._info.battery_level = data[0]
+        return data[0]
+
+    def _on_disconnect(self, client: "BleakClient") -> None:
+        """Disconnect callback function."""
+
+        if client is self._client:
+            self._cancel_idle_timer()
+            self._release_slot()
+        LOGGER.debug("Disconnected from %s", client.address)
+
+    def _notification_handler(self, _sender, data: bytearray) -> None:
+        LOGGER.debug("%s received BLE data: %s", self.name, data.hex(" "))
+        rx_data: bytes = bytes(data)
+        if self._cipher is not None and self._is_encrypted:
+            rx_data = self._cipher.decrypt(data)
+            LOGGER.debug(
+                "%s %s",
+                "decoded data: ".rjust(19 + len(self.name)),
+                rx_data.hex(" "),
+            )
+
+        if len(rx_data) <= SEQ_OFFSET:
+            LOGGER.debug("%s: dropping short response", self.name)
+            return
+        response: Final[asyncio.Future[bytes] | None] = self._in_flight.get(
+            rx_data[SEQ_OFFSET]
+        )
+        if response is None and rx_data[SEQ_OFFSET] not in self._answered:
+            self.stats.late_responses += 1
+            LOGGER.debug("%s: late response #%i", self.name, rx_data[SEQ_OFFSET])
+        elif response is None or response.done():
+            self.stats.duplicate_responses += 1
+            LOGGER.debug("%s: duplicate response #%i", self.name, rx_data[SEQ_OFFSET])
+        else:
+            response.set_result(rx_data)
+
+    async def connect(self) -> None:
+        """Connect ahead of commands, the connection is kept for idle_timeout."""
+        async with self._locked():
+            try:
+                await self._connect()
+            finally:
+                await self._release_connection()
+
+    async def _connect(self, priority: ConnPriority = ConnPriority.USER) -> None:
+        """Connect to the device and setup notification if not connected."""
+
+        LOGGER.debug("Connecting %s", self.name)
+
+        if self.is_connected:
+            LOGGER.debug("%s already connected", self.name)
+            return
+
+        from bleak.exc import BleakError  # noqa: PLC0415
+        from bleak_retry_connector import (  # noqa: PLC0415
+            MAX_CONNECT_ATTEMPTS,
+            establish_connection,
+        )
+
+        start: Final[float] = time.monotonic()
+        candidates: Final[list[BLEDevice]] = self.rssi_history.ranked() or [
+            self._ble_device
+        ]
+        for ble_device in candidates:
+            adapter: str = adapter_of(ble_device)
+            if self._slot is not None and self._slot.adapter != adapter:
+                self._release_slot()
+            if self._slot is None:
+                self._slot = await self._scheduler.acquire(
+                    adapter, priority, self._on_preempt
+                )
+            try:
+                self._client = await establish_connection(
+                    self._client_class,
+                    ble_device,
+                    self.name,
+                    disconnected_callback=self._on_disconnect,
+                    max_attempts=(
+                        MAX_CONNECT_ATTEMPTS
+                        if ble_device is candidates[-1]
+                        else FAILOVER_ATTEMPTS
+                    ),
+                    services=[
+                        UUID_COV_SERVICE,
+                        UUID_DEV_SERVICE,
+                        UUID_BAT_SERVICE,
+                    ],
+                )
+                await self._client.start_notify(UUID_TX, self._notification_handler)
+            except Exception as err:
+                if self.is_connected:
+                    raise
+                self._release_slot()
+                if not isinstance(err, (BleakError, TimeoutError)):
+                    raise
+                self.rssi_history.failed(adapter)
+                if ble_device is candidates[-1]:
+                    raise
+                LOGGER.debug(
+                    "%s: connecting via %s failed (%s), trying next adapter",
+                    self.name,
+                    adapter,
+                    err,
+                )
+                continue
+            self._ble_device = ble_device
+            break
+
+        connect_time: Final[float] = time.monotonic() - start
+        self.metrics.connect.record(connect_time)
+        LOGGER.debug("\tconnect took %.3fs", connect_time)
+
+        # await self._query_dev_info()
+
+    async def disconnect(self) -> None:
+        """Disconnect the device and stop notifications."""
+
+        from bleak.exc import BleakError  # noqa: PLC0415
+
+        self._cancel_idle_timer()
+        if self.is_connected:
+            LOGGER.debug("Disconnecting device %s", self.name)
+            try:
+                await self._client.disconnect()
+            except BleakError:
+                LOGGER.warning("Disconnect failed!")
+        if not self.is_connected:
+            self._release_slot()
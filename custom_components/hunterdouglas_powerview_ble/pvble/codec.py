@@ -0,0 +1,91 @@
+"""Frame codec for the Hunter Douglas PowerView BLE protocol."""
+
+from enum import Enum
+from struct import Struct
+from typing import Final, NamedTuple
+
+
+class ShadeCmd(Enum):
+    """The PowerView cover commands."""
+
+    SET_POSITION = 0x01F7
+    STOP = 0xB8F7
+    ACTIVATE_SCENE = 0xBAF7
+    IDENTIFY = 0x11F7
+
+
+# general cmd: uint16_t cmd, uint8_t seqID, uint8_t data_len
+HEADER: Final[Struct] = Struct("<HBB")
+# position cmd: uint16_t pos1, uint16_t pos2, uint16_t pos3, uint16_t tilt, uint8_t velocity
+POSITION: Final[Struct] = Struct("<HHHHB")
+# uint8_t scene#, uint8_t unknown
+SCENE: Final[Struct] = Struct("<BB")
+# uint8_t beeps
+IDENTIFY: Final[Struct] = Struct("<B")
+# response: uint16_t cmd, uint8_t seqID, uint8_t data_len, uint8_t error
+RESPONSE: Final[Struct] = Struct("<HBBB")
+
+SEQ_OFFSET: Final[int] = 2
+POS_UNCHANGED: Final[int] = 0x8000
+RESPONSE_MASK: Final[int] = 0xFFEF  # shade clears bit 4 of the service ID
+
+
+class PVResponse(NamedTuple):
+    """Decoded response header of a shade notification."""
+
+    cmd: int
+    seq_nr: int
+    data_len: int
+    error: int
+
+
+def _frame(cmd: ShadeCmd, payload_fmt: Struct, *values: int) -> bytearray:
+    """Pack a frame with sequence ID 0 into a single buffer."""
+    frame: Final = bytearray(HEADER.size + payload_fmt.size)
+    HEADER.pack_into(frame, 0, cmd.value, 0, payload_fmt.size)
+    payload_fmt.pack_into(frame, HEADER.size, *values)
+    return frame
+
+
+# pre-encoded constant frames, only the sequence ID needs to be patched
+STOP_FRAME: Final[bytes] = HEADER.pack(ShadeCmd.STOP.value, 0, 0)
+IDENTIFY_FRAME: Final[bytes] = bytes(_frame(ShadeCmd.IDENTIFY, IDENTIFY, 0x3))
+OPEN_FRAME: Final[bytes] = bytes(
+    _frame(ShadeCmd.SET_POSITION, POSITION, 100 * 100, *[POS_UNCHANGED] * 3, 0)
+)
+CLOSE_FRAME: Final[bytes] = bytes(
+    _frame(ShadeCmd.SET_POSITION, POSITION, 0, *[POS_UNCHANGED] * 3, 0)
+)
+
+
+def set_seq(frame: bytearray, seq_nr: int) -> None:
+    """Patch the sequence ID of an encoded frame."""
+    frame[SEQ_OFFSET] = seq_nr
+
+
+def encode_position(
+    pos1: int,
+    pos2: int = POS_UNCHANGED,
+    pos3: int = POS_UNCHANGED,
+    tilt: int = POS_UNCHANGED,
+    velocity: int = 0,
+) -> bytearray:
+    """Encode a set position frame, pos1 is given in 0.01%."""
+    return _frame(ShadeCmd.SET_POSITION, POSITION, pos1, pos2, pos3, tilt, velocity)
+
+
+def encode_scene(idx: int) -> bytearray:
+    """Encode an activate scene frame."""
+    return _frame(ShadeCmd.ACTIVATE_SCENE, SCENE, idx, 0xA2)
+
+
+def encode_identify(beeps: int) -> bytearray:
+    """Encode an identify frame."""
+    frame: Final = bytearray(IDENTIFY_FRAME)
+    IDENTIFY.pack_into(frame, HEADER.size, min(beeps, 0xFF))
+    return frame
+
+
+def decode_response(data: bytes | bytearray | memoryview) -> PVResponse:
+    """Decode the response header in place, data needs RESPONSE.size bytes."""
+    return PVResponse._make(RESPONSE.unpack_from(data))
@@ -0,0 +1,14 @@
+"""Constants of the Hunter Douglas PowerView BLE protocol library."""
+
+import logging
+from typing import Final
+
+LOGGER: Final = logging.getLogger(__package__)
+MFCT_ID: Final[int] = 2073
+TIMEOUT: Final[int] = 5
+IDLE_TIMEOUT: Final[float] = 5.0  # keep connection open after last command
+MAX_IN_FLIGHT: Final[int] = 2  # frames sent without awaiting their response
+
+# keys of decoded advertisements, equal to the Home Assistant cover attributes
+ATTR_CURRENT_POSITION: Final[str] = "current_position"
+ATTR_CURRENT_TILT_POSITION: Final[str] = "current_tilt_position"
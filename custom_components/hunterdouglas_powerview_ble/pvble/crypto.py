@@ -0,0 +1,48 @@
+"""Home key encryption of Hunter Douglas PowerView BLE frames."""
+
+from functools import lru_cache
+from typing import Final
+
+MAX_FRAME_LEN: Final[int] = 4 + 0xFF  # header + maximum data length
+
+
+@lru_cache(maxsize=8)
+def _keystream_masks(home_key: bytes) -> tuple[int, ...]:
+    """Return the keystream for all frame lengths as integers.
+
+    Shades use AES-CTR with a zero nonce that is reset for every frame,
+    so the keystream only depends on the home key and is derived once.
+    """
+    from cryptography.hazmat.primitives.ciphers import (  # noqa: PLC0415
+        Cipher,
+        algorithms,
+        modes,
+    )
+
+    enc: Final = Cipher(algorithms.AES(home_key), modes.CTR(bytes(16))).encryptor()
+    keystream: Final[bytes] = enc.update(bytes(MAX_FRAME_LEN)) + enc.finalize()
+    return tuple(
+        int.from_bytes(keystream[:length]) for length in range(MAX_FRAME_LEN + 1)
+    )
+
+
+class PVCipher:
+    """AES-CTR cipher for PowerView frames based on a cached keystream."""
+
+    __slots__ = ("_masks",)
+
+    def __init__(self, home_key: bytes) -> None:
+        """Initialize cipher for the given 16 byte home key."""
+        if len(home_key) != 16:
+            raise ValueError("Home key needs to be 16 bytes long.")
+        self._masks: Final[tuple[int, ...]] = _keystream_masks(bytes(home_key))
+
+    def apply(self, data: bytes | bytearray | memoryview) -> bytes:
+        """Encrypt or decrypt a frame, both is the same XOR in CTR mode."""
+        length: Final[int] = len(data)
+        if length > MAX_FRAME_LEN:
+            raise ValueError(f"Frame length {length} exceeds {MAX_FRAME_LEN} bytes.")
+        return (int.from_bytes(data) ^ self._masks[length]).to_bytes(length)
+
+    encrypt = apply
+    decrypt = apply
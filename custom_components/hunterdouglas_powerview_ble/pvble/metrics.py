@@ -0,0 +1,150 @@
+"""Latency histograms and rate meters of shade communication."""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import time
+from typing import Any, Final
+
+# upper bucket bounds in seconds, values above the last bound are counted extra
+LATENCY_BOUNDS: Final[tuple[float, ...]] = (
+    0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0,
+)  # fmt: skip
+DECODE_BOUNDS: Final[tuple[float, ...]] = (
+    1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 1e-3,
+)  # fmt: skip
+RATE_WINDOW: Final[float] = 60.0  # s
+
+
+class Histogram:
+    """Histogram with fixed buckets, constant memory and O(log n) updates."""
+
+    __slots__ = ("_bounds", "buckets", "count", "max", "min", "total")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BOUNDS) -> None:
+        """Initialize histogram."""
+        self._bounds: Final[tuple[float, ...]] = bounds
+        self.buckets: Final[list[int]] = [0] * (len(bounds) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def record(self, value: float) -> None:
+        """Add a value in seconds."""
+        self.buckets[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> float | None:
+        """Return mean of recorded values."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Return upper bound of the bucket containing the q-quantile."""
+        if not self.count:
+            return None
+        rank: Final[float] = q * self.count
+        seen: int = 0
+        for bound, cnt in zip(self._bounds, self.buckets, strict=False):
+            seen += cnt
+            if seen >= rank:
+                return bound if self.max is None else min(bound, self.max)
+        return self.max
+
+    def as_dict(self, scale: float = 1e3) -> dict[str, Any]:
+        """Return summary and buckets, scaled to milliseconds by default."""
+
+        def _scaled(value: float | None) -> float | None:
+            return round(value * scale, 3) if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean": _scaled(self.mean),
+            "min": _scaled(self.min),
+            "max": _scaled(self.max),
+            "p50": _scaled(self.quantile(0.5)),
+            "p95": _scaled(self.quantile(0.95)),
+            "buckets": {
+                **{
+                    f"<={_scaled(bound)}": cnt
+                    for bound, cnt in zip(self._bounds, self.buckets, strict=False)
+                },
+                f">{_scaled(self._bounds[-1])}": self.buckets[-1],
+            },
+        }
+
+
+class RateMeter:
+    """Event rate over fixed windows, constant memory."""
+
+    __slots__ = ("_count", "_start", "_window", "rate", "total")
+
+    def __init__(self, window: float = RATE_WINDOW) -> None:
+        """Initialize meter."""
+        self._window: Final[float] = window
+        self._start: float = time.monotonic()
+        self._count: int = 0
+        self.rate: float | None = None  # events/s of the last complete window
+        self.total: int = 0
+
+    def tick(self, now: float | None = None) -> None:
+        """Count an event."""
+        now = time.monotonic() if now is None else now
+        if now - self._start >= self._window:
+            self.rate = self._count / (now - self._start)
+            self._start = now
+            self._count = 0
+        self._count += 1
+        self.total += 1
+
+    def current(self, now: float | None = None) -> float | None:
+        """Return events/s, including a window that passed without events."""
+        now = time.monotonic() if now is None else now
+        if now - self._start >= self._window:
+            return self._count / (now - self._start)
+        return self.rate
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return rate and total count."""
+        rate: Final[float | None] = self.current()
+        return {
+            "rate": round(rate, 3) if rate is not None else None,
+            "total": self.total,
+        }
+
+
+@dataclass
+class PVLinkMetrics:
+    """Latency histograms of the command link to a shade."""
+
+    connect: Histogram = field(default_factory=Histogram)
+    write_ack: Histogram = field(default_factory=Histogram)
+    command: Histogram = field(default_factory=Histogram)
+    lock_wait: Histogram = field(default_factory=Histogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all histograms in milliseconds."""
+        return {
+            "connect": self.connect.as_dict(),
+            "write_ack": self.write_ack.as_dict(),
+            "command": self.command.as_dict(),
+            "lock_wait": self.lock_wait.as_dict(),
+        }
+
+
+@dataclass
+class PVAdvMetrics:
+    """Rate and decode time of advertisements of a shade."""
+
+    adverts: RateMeter = field(default_factory=RateMeter)
+    decode: Histogram = field(default_factory=lambda: Histogram(DECODE_BOUNDS))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return advertisement rate (1/s) and decode time in microseconds."""
+        return {
+            "adverts": self.adverts.as_dict(),
+            "decode": self.decode.as_dict(scale=1e6),
+        }
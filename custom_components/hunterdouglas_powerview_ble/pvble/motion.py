@@ -0,0 +1,146 @@
+"""Motion model estimating shade positions between advertisements."""
+
+import time
+from typing import Any, Final
+
+from .advertisement import PVAdvertisement
+
+SPEED_WEIGHT: Final[float] = 0.3  # weight of a new speed sample
+MIN_SAMPLE_TIME: Final[float] = 0.5  # s, shorter intervals are dominated by jitter
+MAX_SAMPLE_TIME: Final[float] = 30.0  # s, longer ones likely include a stop
+MAX_EXTRAPOLATION: Final[float] = 10.0  # s, hold the estimate without adverts
+OPEN: Final[float] = 100.0
+CLOSED: Final[float] = 0.0
+
+
+class SpeedTable:
+    """Learned travel speeds in %/s, shared by all shades of a type."""
+
+    __slots__ = ("_speeds", "samples")
+
+    def __init__(self) -> None:
+        """Initialize empty table."""
+        self._speeds: Final[dict[int, float]] = {}
+        self.samples: Final[dict[int, int]] = {}
+
+    def get(self, type_id: int) -> float | None:
+        """Return learned speed of a shade type."""
+        return self._speeds.get(type_id)
+
+    def learn(self, type_id: int, speed: float) -> None:
+        """Add a speed sample with an exponentially weighted moving average."""
+        old: Final[float | None] = self._speeds.get(type_id)
+        self._speeds[type_id] = (
+            speed if old is None else old + SPEED_WEIGHT * (speed - old)
+        )
+        self.samples[type_id] = self.samples.get(type_id, 0) + 1
+
+    def as_dict(self) -> dict[int, dict[str, Any]]:
+        """Return speed and number of samples per type."""
+        return {
+            type_id: {"speed": round(speed, 3), "samples": self.samples[type_id]}
+            for type_id, speed in self._speeds.items()
+        }
+
+
+class MotionModel:
+    """Position estimate of a moving shade from its advertised motion bits.
+
+    Consecutive advertisements of a move teach the shade type's speed, in
+    between the position is extrapolated towards the target, or the end
+    position if the move was not commanded by us.
+    """
+
+    __slots__ = ("_position", "_since", "_speeds", "direction", "target", "type_id")
+
+    def __init__(self, speeds: SpeedTable) -> None:
+        """Initialize model of an idle shade at an unknown position."""
+        self._speeds: Final[SpeedTable] = speeds
+        self._position: float | None = None  # last advertised position
+        self._since: float = 0.0  # time.monotonic() it was first advertised
+        self.direction: int = 0  # 1: opening, -1: closing, 0: idle
+        self.target: float | None = None
+        self.type_id: int = 0
+
+    @property
+    def moving(self) -> bool:
+        """Return whether the shade advertises movement."""
+        return self.direction != 0
+
+    @property
+    def speed(self) -> float | None:
+        """Return learned speed of the shade's type in %/s."""
+        return self._speeds.get(self.type_id)
+
+    def update(self, adv: PVAdvertisement, now: float | None = None) -> None:
+        """Add an advertisement, learn the speed from consecutive moving ones.
+
+        Shades repeat an unchanged position, so a position is timed from the
+        first advertisement carrying it.
+        """
+        now = time.monotonic() if now is None else now
+        direction: Final[int] = 1 if adv.is_opening else -1 if adv.is_closing else 0
+        position: Final[float] = adv.current_position
+        self.type_id = adv.type_id
+        if direction != self.direction:
+            if not direction:
+                self.target = None  # move ended
+            self.direction = direction
+        elif position == self._position:
+            return
+        elif (
+            direction
+            and self._position is not None
+            and MIN_SAMPLE_TIME <= (elapsed := now - self._since) <= MAX_SAMPLE_TIME
+            and (moved := (position - self._position) * direction) > 0
+        ):
+            self._speeds.learn(adv.type_id, moved / elapsed)
+        self._position = position
+        self._since = now
+
+    def _end(self) -> float:
+        """Return the position the current move stops at."""
+        if (
+            self.target is not None
+            and self._position is not None
+            and (self.target - self._position) * self.direction >= 0
+        ):
+            return self.target
+        return OPEN if self.direction > 0 else CLOSED
+
+    def position(self, now: float | None = None) -> float | None:
+        """Return the estimated position, the advertised one if idle."""
+        if (
+            self._position is None
+            or not self.direction
+            or (speed := self.speed) is None
+        ):
+            return self._position
+        now = time.monotonic() if now is None else now
+        estimate: Final[float] = self._position + self.direction * speed * min(
+            now - self._since, MAX_EXTRAPOLATION
+        )
+        end: Final[float] = self._end()
+        return min(estimate, end) if self.direction > 0 else max(estimate, end)
+
+    def eta(self, now: float | None = None) -> float | None:
+        """Return estimated seconds until the move ends, None if unknown."""
+        if (
+            not self.direction
+            or (speed := self.speed) is None
+            or (position := self.position(now)) is None
+        ):
+            return None
+        return abs(self._end() - position) / speed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return state and estimates for diagnostics."""
+        now: Final[float] = time.monotonic()
+        return {
+            "direction": self.direction,
+            "advertised": self._position,
+            "estimate": self.position(now),
+            "target": self.target,
+            "speed": self.speed,
+            "eta": self.eta(now),
+        }
@@ -0,0 +1,62 @@
+"""Ranking of the adapters and proxies a shade can be connected by."""
+
+from collections import deque
+import time
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from bleak.backends.device import BLEDevice
+
+RSSI_HISTORY: Final[int] = 5  # samples kept per adapter
+RSSI_MAX_AGE: Final[float] = 60.0  # s, older samples are ignored
+FAILURE_PENALTY: Final[float] = 120.0  # s an adapter is ranked last after failing
+
+
+class RssiHistory:
+    """Recent RSSI of a device as received by each connectable adapter."""
+
+    def __init__(
+        self, history: int = RSSI_HISTORY, max_age: float = RSSI_MAX_AGE
+    ) -> None:
+        """Initialize history."""
+        self._history: Final[int] = history
+        self._max_age: Final[float] = max_age
+        self._samples: Final[dict[str, deque[tuple[float, int]]]] = {}
+        self._devices: Final[dict[str, BLEDevice]] = {}
+        self._failed: Final[dict[str, float]] = {}
+
+    def add(
+        self, source: str, rssi: int, ble_device: "BLEDevice", now: float | None = None
+    ) -> None:
+        """Record an advertisement received by the adapter source."""
+        samples: deque[tuple[float, int]] | None = self._samples.get(source)
+        if samples is None:
+            samples = self._samples[source] = deque(maxlen=self._history)
+        samples.append((time.monotonic() if now is None else now, rssi))
+        self._devices[source] = ble_device
+
+    def failed(self, source: str, now: float | None = None) -> None:
+        """Rank an adapter last for a while, e.g. after a connect timeout."""
+        self._failed[source] = (
+            time.monotonic() if now is None else now
+        ) + FAILURE_PENALTY
+
+    def rssi(self, source: str, now: float | None = None) -> float | None:
+        """Return mean RSSI of the recent samples, None if there are none."""
+        oldest: Final[float] = (
+            time.monotonic() if now is None else now
+        ) - self._max_age
+        recent: Final[list[int]] = [
+            rssi for stamp, rssi in self._samples.get(source, ()) if stamp >= oldest
+        ]
+        return sum(recent) / len(recent) if recent else None
+
+    def ranked(self, now: float | None = None) -> list["BLEDevice"]:
+        """Return devices of adapters that recently heard the shade, best first."""
+        now = time.monotonic() if now is None else now
+        scores: Final[list[tuple[bool, float, str]]] = [
+            (self._failed.get(source, 0) > now, -rssi, source)
+            for source in self._samples
+            if (rssi := self.rssi(source, now)) is not None
+        ]
+        return [self._devices[source] for *_, source in sorted(scores)]
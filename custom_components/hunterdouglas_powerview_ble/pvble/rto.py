@@ -0,0 +1,49 @@
+"""Retransmission timeout estimation from measured round-trip times."""
+
+from dataclasses import dataclass
+from typing import Final
+
+from .const import TIMEOUT
+
+RTO_INITIAL: Final[float] = 1.0  # s, before the first RTT sample
+RTO_MIN: Final[float] = 0.2  # s, covers the connection interval of far shades
+RTO_MAX: Final[float] = TIMEOUT
+ALPHA: Final[float] = 1 / 8  # gain of the smoothed RTT
+BETA: Final[float] = 1 / 4  # gain of the RTT variation
+K: Final[int] = 4  # weight of the RTT variation in the timeout
+
+
+@dataclass
+class RtoEstimator:
+    """Smoothed RTT and its variation to derive the ack timeout, see RFC 6298.
+
+    Only responses to frames that were sent once are sampled (Karn's
+    algorithm), as a response to a retransmitted frame is ambiguous.
+    """
+
+    rto: float = RTO_INITIAL
+    srtt: float | None = None
+    rttvar: float | None = None
+    samples: int = 0
+    rtt_last: float | None = None
+    rtt_min: float | None = None
+    rtt_max: float | None = None
+
+    def sample(self, rtt: float) -> None:
+        """Update estimation with the RTT of a frame that was sent once."""
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - BETA) * self.rttvar + BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - ALPHA) * self.srtt + ALPHA * rtt
+        self.rto = min(max(self.srtt + K * self.rttvar, RTO_MIN), RTO_MAX)
+        self.samples += 1
+        self.rtt_last = rtt
+        self.rtt_min = rtt if self.rtt_min is None else min(self.rtt_min, rtt)
+        self.rtt_max = rtt if self.rtt_max is None else max(self.rtt_max, rtt)
+
+    def backoff(self) -> float:
+        """Double the timeout after an expiry, return the new value."""
+        self.rto = min(self.rto * 2, RTO_MAX)
+        return self.rto
@@ -0,0 +1,186 @@
+"""Scheduler sharing the BLE connection slots of adapters between shades."""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import IntEnum
+import heapq
+import itertools
+import time
+from typing import TYPE_CHECKING, Any, Final
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from bleak.backends.device import BLEDevice
+
+ADAPTER_SLOTS: Final[int] = 2  # concurrent connections per adapter/proxy
+
+
+class ConnPriority(IntEnum):
+    """Priority of a connection request, lower values are served first."""
+
+    STOP = 0
+    USER = 1
+    QUERY = 2
+    POLL = 3
+
+
+@dataclass
+class AdapterStats:
+    """Connection slot statistics of a single adapter."""
+
+    granted: int = 0
+    waited: int = 0
+    preempted: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+
+
+class ConnectionSlot:
+    """Connection slot granted on an adapter."""
+
+    __slots__ = ("_scheduler", "adapter", "idle", "on_preempt", "released")
+
+    def __init__(
+        self,
+        scheduler: "ConnectionScheduler",
+        adapter: str,
+        on_preempt: Callable[[], None] | None,
+    ) -> None:
+        """Initialize slot."""
+        self._scheduler: Final = scheduler
+        self.adapter: Final[str] = adapter
+        self.on_preempt: Final = on_preempt
+        self.idle: bool = False
+        self.released: bool = False
+
+    def release(self) -> None:
+        """Return slot to the scheduler, repeated calls are ignored."""
+        self._scheduler.release(self)
+
+    def set_idle(self, idle: bool) -> None:
+        """Mark connection idle, idle connections yield to waiting requests."""
+        self._scheduler.set_idle(self, idle)
+
+
+def adapter_of(ble_device: "BLEDevice") -> str:
+    """Return the adapter (or proxy) a device is reached by."""
+    details: Final[Any] = ble_device.details
+    if isinstance(details, dict):
+        if source := details.get("source"):
+            return str(source)
+        if isinstance(path := details.get("path"), str) and path.count("/") >= 3:
+            return path.split("/")[3]  # /org/bluez/hci0/dev_...
+    return "default"
+
+
+_Waiter = tuple[int, int, Callable[[], None] | None, asyncio.Future[ConnectionSlot]]
+
+
+class ConnectionScheduler:
+    """Limit concurrent connections per adapter and serve waiters by priority."""
+
+    def __init__(self, slots_per_adapter: int = ADAPTER_SLOTS) -> None:
+        """Initialize scheduler."""
+        self._limit: Final[int] = slots_per_adapter
+        self._active: Final[dict[str, list[ConnectionSlot]]] = {}
+        self._waiters: Final[dict[str, list[_Waiter]]] = {}
+        self._order: Final = itertools.count()
+        self.stats: Final[dict[str, AdapterStats]] = {}
+
+    @property
+    def slots(self) -> int:
+        """Return number of connection slots per adapter."""
+        return self._limit
+
+    def queue_depth(self, adapter: str | None = None) -> int:
+        """Return number of waiting requests for an adapter or in total."""
+        if adapter is not None:
+            return sum(not fut.done() for *_, fut in self._waiters.get(adapter, []))
+        return sum(self.queue_depth(name) for name in self._waiters)
+
+    def active(self, adapter: str) -> int:
+        """Return number of connection slots in use on an adapter."""
+        return len(self._active.get(adapter, []))
+
+    async def acquire(
+        self,
+        adapter: str,
+        priority: ConnPriority = ConnPriority.USER,
+        on_preempt: Callable[[], None] | None = None,
+    ) -> ConnectionSlot:
+        """Wait for a free connection slot on the adapter.
+
+        on_preempt is called when the slot is idle but requested by others.
+        """
+        stats: Final[AdapterStats] = self.stats.setdefault(adapter, AdapterStats())
+        active: Final[list[ConnectionSlot]] = self._active.setdefault(adapter, [])
+        if len(active) < self._limit and not self.queue_depth(adapter):
+            return self._grant(adapter, on_preempt)
+
+        waiter: Final[asyncio.Future[ConnectionSlot]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(
+            self._waiters.setdefault(adapter, []),
+            (priority, next(self._order), on_preempt, waiter),
+        )
+        LOGGER.debug(
+            "%s: waiting for connection slot (%s), %i queued",
+            adapter,
+            priority.name,
+            self.queue_depth(adapter),
+        )
+        self._preempt_idle(adapter)
+        start: Final[float] = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                waiter.result().release()  # granted while being cancelled
+            raise
+        wait_time: Final[float] = time.monotonic() - start
+        stats.waited += 1
+        stats.wait_time_total += wait_time
+        stats.wait_time_max = max(stats.wait_time_max, wait_time)
+        return waiter.result()
+
+    def _grant(
+        self, adapter: str, on_preempt: Callable[[], None] | None
+    ) -> ConnectionSlot:
+        slot: Final = ConnectionSlot(self, adapter, on_preempt)
+        self._active.setdefault(adapter, []).append(slot)
+        self.stats.setdefault(adapter, AdapterStats()).granted += 1
+        return slot
+
+    def release(self, slot: ConnectionSlot) -> None:
+        """Free a slot and hand it to the next waiter."""
+        if slot.released:
+            return
+        slot.released = True
+        self._active[slot.adapter].remove(slot)
+        waiters: Final = self._waiters.get(slot.adapter, [])
+        while waiters and len(self._active[slot.adapter]) < self._limit:
+            *_, on_preempt, waiter = heapq.heappop(waiters)
+            if not waiter.done():
+                waiter.set_result(self._grant(slot.adapter, on_preempt))
+
+    def set_idle(self, slot: ConnectionSlot, idle: bool) -> None:
+        """Mark slot (not) idle and preempt it if others are waiting."""
+        slot.idle = idle
+        if idle:
+            self._preempt_idle(slot.adapter)
+
+    def _preempt_idle(self, adapter: str) -> None:
+        """Ask idle connections to disconnect while requests are waiting."""
+        waiting: int = self.queue_depth(adapter)
+        for slot in list(self._active.get(adapter, [])):
+            if waiting <= 0:
+                break
+            if slot.idle and slot.on_preempt is not None:
+                LOGGER.debug("%s: preempting idle connection", adapter)
+                slot.idle = False
+                self.stats[adapter].preempted += 1
+                slot.on_preempt()
+                waiting -= 1
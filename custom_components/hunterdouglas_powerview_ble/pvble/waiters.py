@@ -0,0 +1,95 @@
+"""Waiters resolved once advertisements show a shade stopped at its target."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Final
+
+from .advertisement import PVAdvertisement
+
+
+@dataclass(slots=True)
+class _Waiter:
+    position: float | None
+    tilt: int | None
+    tolerance: float
+    future: asyncio.Future[PVAdvertisement]
+
+    def matches(self, adv: PVAdvertisement) -> bool:
+        """Return whether the advertised values are within tolerance."""
+        return (
+            self.position is None
+            or abs(adv.current_position - self.position) <= self.tolerance
+        ) and (
+            self.tilt is None
+            or abs(adv.current_tilt_position - self.tilt) <= self.tolerance
+        )
+
+
+class TargetWaiters:
+    """Pending waits of one shade, checked only against its advertisements.
+
+    Advertisements of a moving shade and repeated ones without new waiters
+    are skipped in constant time, so pending waits cost nothing until an
+    advertisement can resolve them.
+    """
+
+    __slots__ = ("_checked", "_waiters", "last")
+
+    def __init__(self) -> None:
+        """Initialize without waiters."""
+        self._waiters: Final[list[_Waiter]] = []
+        self._checked: bool = True  # waiters were checked against last
+        self.last: PVAdvertisement | None = None
+
+    def __len__(self) -> int:
+        """Return number of pending waiters."""
+        return len(self._waiters)
+
+    def add(
+        self, position: float | None, tilt: int | None, tolerance: float
+    ) -> asyncio.Future[PVAdvertisement]:
+        """Return a future resolved with the next advertisement at the target.
+
+        Only advertisements received after the call count, the last one may
+        predate a just sent command. Without position and tilt, any
+        advertisement of a stopped shade resolves it.
+        """
+        future: Final[asyncio.Future[PVAdvertisement]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._waiters.append(_Waiter(position, tilt, tolerance, future))
+        self._checked = False  # a repeated payload is a new advertisement
+        return future
+
+    def discard(self, future: asyncio.Future[PVAdvertisement]) -> None:
+        """Remove the waiter of a future, e.g. after a timeout."""
+        self._waiters[:] = [
+            waiter for waiter in self._waiters if waiter.future is not future
+        ]
+
+    def check(self, adv: PVAdvertisement) -> int:
+        """Resolve waiters matching an advertisement, return their number."""
+        if adv is self.last and self._checked:
+            return 0  # decoded advertisements are cached, payload repeated
+        self.last = adv
+        self._checked = True
+        if not self._waiters or adv.is_opening or adv.is_closing:
+            return 0
+        pending: Final[list[_Waiter]] = []
+        resolved: int = 0
+        for waiter in self._waiters:
+            if waiter.future.done():
+                continue
+            if waiter.matches(adv):
+                waiter.future.set_result(adv)
+                resolved += 1
+            else:
+                pending.append(waiter)
+        self._waiters[:] = pending
+        return resolved
+
+    def cancel(self) -> None:
+        """Cancel all pending waiters, e.g. when the shade is removed."""
+        for waiter in self._waiters:
+            waiter.future.cancel()
+        self._waiters.clear()
@@ -1,5 +1,8 @@
 """Platform for sensor integration."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
+
 from homeassistant.components.bluetooth.passive_update_coordinator import (
     PassiveBluetoothCoordinatorEntity,
 )
@@ -10,6 +13,8 @@ from homeassistant.const import (
     PERCENTAGE,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     EntityCategory,
+    UnitOfFrequency,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import format_mac
@@ -18,6 +23,22 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import ConfigEntryType
 from .const import ATTR_RSSI, DOMAIN
 from .coordinator import PVCoordinator
+from .pvble.metrics import Histogram
+
+
+@dataclass(frozen=True, kw_only=True)
+class PVMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor showing communication metrics."""
+
+    value_fn: Callable[[PVCoordinator], float | None]
+    state_class: SensorStateClass | str | None = SensorStateClass.MEASUREMENT
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+def _mean_ms(hist: Histogram) -> float | None:
+    return round(hist.mean * 1e3, 1) if hist.mean is not None else None
+
 
 SENSOR_TYPES: list[SensorEntityDescription] = [
     SensorEntityDescription(
@@ -39,6 +60,38 @@ SENSOR_TYPES: list[SensorEntityDescription] = [
 ]
 
 
+METRIC_SENSOR_TYPES: list[PVMetricSensorEntityDescription] = [
+    PVMetricSensorEntityDescription(
+        key="connect_latency",
+        translation_key="connect_latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda pv_dev: _mean_ms(pv_dev.api.metrics.connect),
+    ),
+    PVMetricSensorEntityDescription(
+        key="ack_latency",
+        translation_key="ack_latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda pv_dev: _mean_ms(pv_dev.api.metrics.write_ack),
+    ),
+    PVMetricSensorEntityDescription(
+        key="command_latency",
+        translation_key="command_latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda pv_dev: _mean_ms(pv_dev.api.metrics.command),
+    ),
+    PVMetricSensorEntityDescription(
+        key="advertisement_rate",
+        translation_key="advertisement_rate",
+        native_unit_of_measurement=UnitOfFrequency.HERTZ,
+        suggested_display_precision=2,
+        value_fn=lambda pv_dev: pv_dev.adv_metrics.adverts.current(),
+    ),
+]
+
+
 async def async_setup_entry(
     _hass: HomeAssistant,
     config_entry: ConfigEntryType,
@@ -51,6 +104,10 @@ async def async_setup_entry(
         async_add_entities(
             [PVSensor(pv_dev, descr, format_mac(config_entry.unique_id))]
         )
+    async_add_entities(
+        PVMetricSensor(pv_dev, descr, format_mac(config_entry.unique_id))
+        for descr in METRIC_SENSOR_TYPES
+    )
 
 
 class PVSensor(PassiveBluetoothCoordinatorEntity[PVCoordinator], SensorEntity):  # type: ignore[reportIncompatibleMethodOverride]
@@ -65,9 +122,21 @@ class PVSensor(PassiveBluetoothCoordinatorEntity[PVCoordinator], SensorEntity):
         self._attr_unique_id = f"{DOMAIN}-{unique_id}-{descr.key}"
         self._attr_device_info = pv_dev.device_info
         self.entity_description = descr
-        super().__init__(pv_dev)
+        super().__init__(pv_dev, frozenset({descr.key}))
 
     @property
     def native_value(self) -> int | float | None:  # type: ignore[reportIncompatibleVariableOverride]
         """Return the sensor value."""
         return self.coordinator.data.get(self.entity_description.key)
+
+
+class PVMetricSensor(PVSensor):
+    """Diagnostic sensor polling the communication metrics."""
+
+    _attr_should_poll = True
+    entity_description: PVMetricSensorEntityDescription
+
+    @property
+    def native_value(self) -> float | None:  # type: ignore[reportIncompatibleVariableOverride]
+        """Return the metric value."""
+        return self.entity_description.value_fn(self.coordinator)
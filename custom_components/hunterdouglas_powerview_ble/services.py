@@ -0,0 +1,365 @@
+"""Services of the Hunter Douglas PowerView (BLE) integration."""
+
+import asyncio
+from collections.abc import Coroutine, Sequence
+from datetime import datetime, timedelta
+from pathlib import Path
+import time
+from typing import Any, Final
+
+from bleak.exc import BleakError
+import voluptuous as vol
+
+from homeassistant.components.cover import (
+    ATTR_CURRENT_POSITION,
+    ATTR_POSITION,
+    ATTR_TILT_POSITION,
+)
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.util.hass_dict import HassKey
+
+from .capture import CaptureWriter
+from .const import DOMAIN, LOGGER, WAIT_TIMEOUT, WAIT_TOLERANCE
+from .coordinator import DATA_CAPTURE, DATA_SCHEDULER, PVCoordinator
+from .pvble.advertisement import PVAdvertisement
+from .pvble.scheduler import ConnectionScheduler
+
+SERVICE_SET_POSITIONS: Final[str] = "set_positions"
+SERVICE_START_CAPTURE: Final[str] = "start_capture"
+SERVICE_STOP_CAPTURE: Final[str] = "stop_capture"
+SERVICE_WAIT_FOR_TARGET: Final[str] = "wait_for_target"
+ATTR_SHADES: Final[str] = "shades"
+ATTR_FILENAME: Final[str] = "filename"
+ATTR_DURATION: Final[str] = "duration"
+ATTR_TOLERANCE: Final[str] = "tolerance"
+ATTR_TIMEOUT: Final[str] = "timeout"
+CAPTURE_FILE: Final[str] = f"{DOMAIN}.pvcap"
+CAPTURE_FLUSH_INTERVAL: Final[timedelta] = timedelta(seconds=10)
+
+DATA_CAPTURE_UNSUB: Final[HassKey[list[CALLBACK_TYPE]]] = HassKey(
+    f"{DOMAIN}_capture_unsub"
+)
+
+SHADE_SCHEMA: Final = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+            vol.Optional(ATTR_POSITION): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100)
+            ),
+            vol.Optional(ATTR_TILT_POSITION): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_POSITION, ATTR_TILT_POSITION),
+)
+SET_POSITIONS_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_SHADES): vol.All(
+            cv.ensure_list, vol.Length(min=1), [SHADE_SCHEMA]
+        )
+    }
+)
+
+START_CAPTURE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Optional(ATTR_FILENAME, default=CAPTURE_FILE): cv.string,
+        vol.Optional(ATTR_DURATION): cv.positive_time_period,
+    }
+)
+
+WAIT_FOR_TARGET_SCHEMA: Final = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_POSITION): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100)
+            ),
+            vol.Optional(ATTR_TILT_POSITION): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100)
+            ),
+            vol.Optional(ATTR_TOLERANCE, default=WAIT_TOLERANCE): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=100)
+            ),
+            vol.Optional(
+                ATTR_TIMEOUT, default=timedelta(seconds=WAIT_TIMEOUT)
+            ): cv.positive_time_period,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_POSITION, ATTR_TILT_POSITION),
+)
+
+type _Target = tuple[str, PVCoordinator, int, int | None]
+
+
+def _coordinator(hass: HomeAssistant, entity_id: str) -> PVCoordinator:
+    """Return the coordinator of a PowerView cover entity."""
+    entity: Final = er.async_get(hass).async_get(entity_id)
+    if (
+        entity is None
+        or entity.platform != DOMAIN
+        or entity.config_entry_id is None
+        or (entry := hass.config_entries.async_get_entry(entity.config_entry_id))
+        is None
+        or not isinstance(
+            coordinator := getattr(entry, "runtime_data", None), PVCoordinator
+        )
+    ):
+        raise ServiceValidationError(
+            f"{entity_id} is not a loaded PowerView BLE shade",
+            translation_domain=DOMAIN,
+            translation_key="unknown_shade",
+            translation_placeholders={"entity_id": entity_id},
+        )
+    return coordinator
+
+
+def _waves(targets: Sequence[_Target], slots: int) -> list[list[list[_Target]]]:
+    """Split targets per adapter into batches that fit its connection slots.
+
+    Shades are grouped by the adapter their next connection will use.
+    """
+    per_adapter: Final[dict[str, list[_Target]]] = {}
+    for target in targets:
+        per_adapter.setdefault(target[1].api.next_adapter, []).append(target)
+    return [
+        [
+            adapter_targets[idx : idx + slots]
+            for idx in range(0, len(adapter_targets), slots)
+        ]
+        for adapter_targets in per_adapter.values()
+    ]
+
+
+async def _async_collect(
+    results: dict[str, dict[str, Any]], jobs: dict[str, Coroutine[Any, Any, None]]
+) -> None:
+    """Run jobs in parallel and store connection errors per shade."""
+    for entity_id, outcome in zip(
+        jobs, await asyncio.gather(*jobs.values(), return_exceptions=True), strict=True
+    ):
+        if isinstance(outcome, (BleakError, TimeoutError)):
+            LOGGER.warning("%s: bulk position failed: %s", entity_id, outcome)
+            results[entity_id]["error"] = str(outcome) or type(outcome).__name__
+        elif isinstance(outcome, BaseException):
+            raise outcome
+
+
+async def _async_run_wave(
+    wave: list[_Target], start: float
+) -> dict[str, dict[str, Any]]:
+    """Connect all shades of a wave in parallel, then send all positions."""
+    results: Final[dict[str, dict[str, Any]]] = {
+        entity_id: {"success": False} for entity_id, *_ in wave
+    }
+
+    async def _connect(target: _Target) -> None:
+        await target[1].api.connect()
+        results[target[0]]["connected"] = round(time.monotonic() - start, 3)
+
+    async def _move(target: _Target) -> None:
+        entity_id, coordinator, position, tilt = target
+        results[entity_id]["sent"] = round(time.monotonic() - start, 3)
+        if tilt is None:
+            success = await coordinator.api.set_position(position)
+        else:
+            success = await coordinator.api.set_position(position, tilt=tilt)
+        results[entity_id]["success"] = success
+        results[entity_id]["acknowledged"] = round(time.monotonic() - start, 3)
+
+    await _async_collect(results, {target[0]: _connect(target) for target in wave})
+    await _async_collect(
+        results,
+        {
+            target[0]: _move(target)
+            for target in wave
+            if "error" not in results[target[0]]
+        },
+    )
+    return results
+
+
+async def _async_run_waves(
+    waves: list[list[_Target]], start: float
+) -> dict[str, dict[str, Any]]:
+    """Run the waves of one adapter one after another."""
+    results: Final[dict[str, dict[str, Any]]] = {}
+    for wave in waves:
+        results.update(await _async_run_wave(wave, start))
+    return results
+
+
+async def _async_set_positions(call: ServiceCall) -> ServiceResponse:
+    """Move multiple shades with minimal spread between their start times."""
+    targets: Final[list[_Target]] = []
+    for shade in call.data[ATTR_SHADES]:
+        coordinator: PVCoordinator = _coordinator(call.hass, shade[ATTR_ENTITY_ID])
+        position: int | float | bool | None = shade.get(
+            ATTR_POSITION, coordinator.data.get(ATTR_CURRENT_POSITION)
+        )
+        if position is None:
+            raise ServiceValidationError(
+                f"Position of {shade[ATTR_ENTITY_ID]} is unknown",
+                translation_domain=DOMAIN,
+                translation_key="unknown_position",
+                translation_placeholders={"entity_id": shade[ATTR_ENTITY_ID]},
+            )
+        targets.append(
+            (
+                shade[ATTR_ENTITY_ID],
+                coordinator,
+                round(position),
+                shade.get(ATTR_TILT_POSITION),
+            )
+        )
+
+    if (scheduler := call.hass.data.get(DATA_SCHEDULER)) is None:
+        call.hass.data[DATA_SCHEDULER] = scheduler = ConnectionScheduler()
+    start: Final[float] = time.monotonic()
+    results: Final[dict[str, dict[str, Any]]] = {}
+    # adapters have their own slots, their waves run in parallel
+    for adapter_results in await asyncio.gather(
+        *(_async_run_waves(waves, start) for waves in _waves(targets, scheduler.slots))
+    ):
+        results.update(adapter_results)
+
+    sent: Final[list[float]] = [
+        res["sent"] for res in results.values() if res["success"]
+    ]
+    return {
+        ATTR_SHADES: results,
+        "duration": round(time.monotonic() - start, 3),
+        "spread": round(max(sent) - min(sent), 3) if sent else None,
+    }
+
+
+async def _async_wait_for_target(call: ServiceCall) -> ServiceResponse:
+    """Wait until shades advertise their target and stopped moving."""
+    coordinators: Final[dict[str, PVCoordinator]] = {
+        entity_id: _coordinator(call.hass, entity_id)
+        for entity_id in call.data[ATTR_ENTITY_ID]
+    }
+    start: Final[float] = time.monotonic()
+    outcomes: Final[list[PVAdvertisement | BaseException]] = await asyncio.gather(
+        *(
+            coordinator.async_wait_for_target(
+                call.data.get(ATTR_POSITION),
+                call.data.get(ATTR_TILT_POSITION),
+                call.data[ATTR_TOLERANCE],
+                call.data[ATTR_TIMEOUT].total_seconds(),
+            )
+            for coordinator in coordinators.values()
+        ),
+        return_exceptions=True,
+    )
+    results: Final[dict[str, dict[str, Any]]] = {}
+    timed_out: Final[list[str]] = []
+    for entity_id, outcome in zip(coordinators, outcomes, strict=True):
+        if isinstance(outcome, TimeoutError):
+            timed_out.append(entity_id)
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results[entity_id] = {
+                ATTR_POSITION: outcome.current_position,
+                ATTR_TILT_POSITION: outcome.current_tilt_position,
+            }
+    if timed_out:
+        raise HomeAssistantError(
+            f"{', '.join(timed_out)} did not reach the target in time",
+            translation_domain=DOMAIN,
+            translation_key="wait_timeout",
+            translation_placeholders={"entity_ids": ", ".join(timed_out)},
+        )
+    return {ATTR_SHADES: results, "duration": round(time.monotonic() - start, 3)}
+
+
+async def _async_close_capture(hass: HomeAssistant) -> dict[str, Any] | None:
+    """Stop a running capture and write the remaining records."""
+    for unsub in hass.data.pop(DATA_CAPTURE_UNSUB, []):
+        unsub()
+    if (writer := hass.data.pop(DATA_CAPTURE, None)) is None:
+        return None
+    await hass.async_add_executor_job(writer.close)
+    LOGGER.info("Captured %i advertisements to %s", writer.records, writer.path)
+    return {ATTR_FILENAME: str(writer.path), "records": writer.records}
+
+
+async def _async_start_capture(call: ServiceCall) -> None:
+    """Record advertisements of all shades to a capture file."""
+    hass: Final[HomeAssistant] = call.hass
+    path: Final[Path] = Path(hass.config.path(call.data[ATTR_FILENAME]))
+    if not hass.config.is_allowed_path(str(path)):
+        raise ServiceValidationError(
+            f"Writing to {path} is not allowed",
+            translation_domain=DOMAIN,
+            translation_key="path_not_allowed",
+            translation_placeholders={ATTR_FILENAME: str(path)},
+        )
+    await _async_close_capture(hass)
+    writer: Final[CaptureWriter] = await hass.async_add_executor_job(
+        CaptureWriter, path
+    )
+
+    async def _async_flush(_now: datetime) -> None:
+        await hass.async_add_executor_job(writer.write, writer.take())
+
+    async def _async_stop(_now: datetime) -> None:
+        await _async_close_capture(hass)
+
+    unsubs: Final[list[CALLBACK_TYPE]] = [
+        async_track_time_interval(hass, _async_flush, CAPTURE_FLUSH_INTERVAL)
+    ]
+    if (duration := call.data.get(ATTR_DURATION)) is not None:
+        unsubs.append(async_call_later(hass, duration, _async_stop))
+    hass.data[DATA_CAPTURE] = writer
+    hass.data[DATA_CAPTURE_UNSUB] = unsubs
+    LOGGER.info("Capturing advertisements to %s", path)
+
+
+async def _async_stop_capture(call: ServiceCall) -> ServiceResponse:
+    """Stop recording advertisements."""
+    return await _async_close_capture(call.hass)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_POSITIONS,
+        _async_set_positions,
+        schema=SET_POSITIONS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WAIT_FOR_TARGET,
+        _async_wait_for_target,
+        schema=WAIT_FOR_TARGET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        _async_start_capture,
+        schema=START_CAPTURE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_CAPTURE,
+        _async_stop_capture,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
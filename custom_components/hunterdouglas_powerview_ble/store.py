@@ -0,0 +1,295 @@
+"""Columnar state store of all shades, updated in place by the coordinators."""
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from itertools import compress
+import time
+from typing import Final
+
+from homeassistant.components.cover import (
+    ATTR_CURRENT_POSITION,
+    ATTR_CURRENT_TILT_POSITION,
+)
+
+from .const import ATTR_RSSI
+from .pvble.advertisement import PVAdvertisement
+
+# flags column
+SEEN: Final[int] = 0x01  # RSSI is valid
+ADV: Final[int] = 0x02  # advertised values are valid
+OPENING: Final[int] = 0x04
+CLOSING: Final[int] = 0x08
+CHARGING: Final[int] = 0x10
+RESET_MODE: Final[int] = 0x20
+RESET_CLOCK: Final[int] = 0x40
+
+
+@dataclass(frozen=True, slots=True)
+class _Field:
+    """Column of a coordinator data key."""
+
+    key: str
+    attr: str  # PVAdvertisement attribute
+    column: str  # numeric column, flags for booleans
+    bit: int = 0
+    scale: int = 1  # stored as round(value * scale)
+
+
+# advertised values in the order of PVAdvertisement.as_dict()
+ADV_FIELDS: Final[tuple[_Field, ...]] = (
+    _Field(ATTR_CURRENT_POSITION, "current_position", "position", scale=10),
+    _Field("position2", "position2", "position2"),
+    _Field("position3", "position3", "position3"),
+    _Field(ATTR_CURRENT_TILT_POSITION, "current_tilt_position", "tilt"),
+    _Field("home_id", "home_id", "home_id"),
+    _Field("type_id", "type_id", "type_id"),
+    _Field("is_opening", "is_opening", "flags", OPENING),
+    _Field("is_closing", "is_closing", "flags", CLOSING),
+    _Field("battery_charging", "battery_charging", "flags", CHARGING),
+    _Field("battery_level", "battery_level", "battery"),
+    _Field("resetMode", "reset_mode", "flags", RESET_MODE),
+    _Field("resetClock", "reset_clock", "flags", RESET_CLOCK),
+)
+RSSI_FIELD: Final[_Field] = _Field(ATTR_RSSI, "rssi", "rssi")
+FLAG_FIELDS: Final[tuple[_Field, ...]] = tuple(fld for fld in ADV_FIELDS if fld.bit)
+FLAG_MASK: Final[int] = OPENING | CLOSING | CHARGING | RESET_MODE | RESET_CLOCK
+FIELDS: Final[dict[str, _Field]] = {fld.key: fld for fld in (RSSI_FIELD, *ADV_FIELDS)}
+# array type codes of the numeric columns
+COLUMNS: Final[dict[str, str]] = {
+    "position": "H",  # 0.1%
+    "position2": "H",
+    "position3": "B",
+    "tilt": "B",
+    "home_id": "H",
+    "type_id": "B",
+    "battery": "B",
+    "rssi": "b",
+    "flags": "B",
+    "last_seen": "d",  # time.monotonic()
+}
+
+
+class ShadeState(Mapping[str, int | float | bool]):
+    """Read-only view of the coordinator data of one shade."""
+
+    __slots__ = ("_slot", "_store")
+
+    def __init__(self, store: "FleetStore", slot: int) -> None:
+        """Initialize view of a store slot."""
+        self._store: Final[FleetStore] = store
+        self._slot: Final[int] = slot
+
+    def __getitem__(self, key: str) -> int | float | bool:
+        """Return value of a key present in the slot."""
+        if (fld := FIELDS.get(key)) is None:
+            raise KeyError(key)
+        flags: Final[int] = self._store.flags[self._slot]
+        if not flags & (SEEN if fld is RSSI_FIELD else ADV):
+            raise KeyError(key)
+        if fld.bit:
+            return bool(flags & fld.bit)
+        raw: Final[int] = self._store.columns[fld.column][self._slot]
+        return raw / fld.scale if fld.scale != 1 else raw
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys present in the slot."""
+        flags: Final[int] = self._store.flags[self._slot]
+        if flags & SEEN:
+            yield ATTR_RSSI
+        if flags & ADV:
+            yield from (fld.key for fld in ADV_FIELDS)
+
+    def __len__(self) -> int:
+        """Return number of keys present in the slot."""
+        flags: Final[int] = self._store.flags[self._slot]
+        return bool(flags & SEEN) + (len(ADV_FIELDS) if flags & ADV else 0)
+
+
+class FleetStore:
+    """Fixed numeric columns of all shades, indexed by slot.
+
+    A shade takes about 20 bytes instead of a dictionary per advertisement and
+    fleet-wide queries scan compact arrays.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty store."""
+        self.columns: Final[dict[str, array]] = {
+            name: array(code) for name, code in COLUMNS.items()
+        }
+        self.flags: Final[array] = self.columns["flags"]
+        self.last_seen: Final[array] = self.columns["last_seen"]
+        self._rssi: Final[array] = self.columns["rssi"]
+        self._adv_columns: Final[tuple[tuple[_Field, array], ...]] = tuple(
+            (fld, self.columns[fld.column]) for fld in ADV_FIELDS if not fld.bit
+        )
+        self.addresses: Final[list[str | None]] = []
+        self._slots: Final[dict[str, int]] = {}  # address -> latest slot
+        self._last: Final[list[PVAdvertisement | None]] = []
+        self._free: Final[list[int]] = []
+
+    def __len__(self) -> int:
+        """Return number of allocated slots."""
+        return len(self.addresses) - len(self._free)
+
+    @property
+    def nbytes(self) -> int:
+        """Return size of the column data."""
+        return sum(col.itemsize * len(col) for col in self.columns.values())
+
+    def add(self, address: str) -> int:
+        """Allocate an empty slot for a shade."""
+        slot: int
+        if self._free:
+            slot = self._free.pop()
+            for col in self.columns.values():
+                col[slot] = 0
+            self.addresses[slot] = address
+        else:
+            for col in self.columns.values():
+                col.append(0)
+            self.addresses.append(address)
+            self._last.append(None)
+            slot = len(self.addresses) - 1
+        self._slots[address] = slot
+        return slot
+
+    def remove(self, slot: int) -> None:
+        """Release a slot."""
+        if (address := self.addresses[slot]) and self._slots.get(address) == slot:
+            del self._slots[address]
+        self.flags[slot] = 0
+        self.addresses[slot] = None
+        self._last[slot] = None
+        self._free.append(slot)
+
+    def slot(self, address: str) -> int | None:
+        """Return slot of a shade."""
+        return self._slots.get(address)
+
+    def view(self, slot: int) -> ShadeState:
+        """Return mapping of the slot's values."""
+        return ShadeState(self, slot)
+
+    def update(
+        self,
+        slot: int,
+        rssi: int,
+        adv: PVAdvertisement | None,
+        deadbands: Mapping[str, float],
+    ) -> set[str]:
+        """Update values outside their deadband in place, return changed keys.
+
+        Values within the deadband keep the last reported value, advertised
+        keys disappear if an advertisement could not be decoded.
+        """
+        changed: Final[set[str]] = set()
+        flags: Final[int] = self.flags[slot]
+        rssi = max(-128, min(rssi, 127))
+        if self._changed(
+            self._rssi[slot], rssi, flags & SEEN, deadbands.get(ATTR_RSSI)
+        ):
+            self._rssi[slot] = rssi
+            changed.add(ATTR_RSSI)
+        if adv is None:
+            if flags & ADV:
+                changed.update(fld.key for fld in ADV_FIELDS)
+            self.flags[slot] = flags & ~ADV | SEEN
+        elif adv is not self._last[slot] or not flags & ADV:
+            # decoded advertisements are cached, a repeated payload is the
+            # same object and all values are already within their deadband
+            for fld, column in self._adv_columns:
+                raw: int = (
+                    round(getattr(adv, fld.attr) * fld.scale)
+                    if fld.scale != 1
+                    else getattr(adv, fld.attr)
+                )
+                if self._changed(
+                    column[slot], raw, flags & ADV, deadbands.get(fld.key), fld.scale
+                ):
+                    column[slot] = raw
+                    changed.add(fld.key)
+            bits: int = SEEN | ADV
+            for fld in FLAG_FIELDS:
+                if getattr(adv, fld.attr):
+                    bits |= fld.bit
+            if diff := (bits ^ flags) & FLAG_MASK if flags & ADV else FLAG_MASK:
+                changed.update(fld.key for fld in FLAG_FIELDS if diff & fld.bit)
+            self.flags[slot] = bits
+        self._last[slot] = adv
+        self.last_seen[slot] = time.monotonic()
+        return changed
+
+    def update_battery(self, slot: int, level: int) -> set[str]:
+        """Store a battery level on the advertised scale, return changed keys.
+
+        last_seen is left to advertisements, so a polled shade stays stale.
+        """
+        column: Final[array] = self.columns["battery"]
+        if column[slot] == level:
+            return set()
+        column[slot] = level
+        return {"battery_level"} if self.flags[slot] & ADV else set()
+
+    @staticmethod
+    def _changed(
+        old: int, new: int, valid: int, deadband: float | None, scale: int = 1
+    ) -> bool:
+        """Return whether a raw value is new or outside the deadband of the old."""
+        if not valid:
+            return True
+        if deadband is None:
+            return new != old
+        return abs(new - old) >= deadband * scale
+
+    def _select(self, mask: int) -> list[str]:
+        return list(  # released slots have no flags set
+            compress(self.addresses, [flags & mask for flags in self.flags])
+        )
+
+    def moving(self) -> list[str]:
+        """Return addresses of shades that advertise movement."""
+        return self._select(OPENING | CLOSING)
+
+    def charging(self) -> list[str]:
+        """Return addresses of shades that are charging."""
+        return self._select(CHARGING)
+
+    def low_battery(self, threshold: int = 20) -> list[str]:
+        """Return addresses of shades at or below the battery level."""
+        return list(
+            compress(
+                self.addresses,
+                [
+                    flags & ADV and level <= threshold
+                    for flags, level in zip(
+                        self.flags, self.columns["battery"], strict=True
+                    )
+                ],
+            )
+        )
+
+    def stale(self, max_age: float, now: float | None = None) -> list[str]:
+        """Return addresses of shades not seen for max_age seconds."""
+        limit: Final[float] = (time.monotonic() if now is None else now) - max_age
+        return [
+            addr
+            for addr, seen in zip(self.addresses, self.last_seen, strict=True)
+            if addr is not None and seen < limit
+        ]
+
+    def mean_position(self, addresses: Iterable[str] | None = None) -> float | None:
+        """Return mean position of the shades, e.g. of a room, or of all."""
+        positions: Final[array] = self.columns["position"]
+        selected: Final[list[int]] = (
+            list(compress(positions, [flags & ADV for flags in self.flags]))
+            if addresses is None
+            else [
+                positions[slot]
+                for addr in addresses
+                if (slot := self._slots.get(addr)) is not None
+                and self.flags[slot] & ADV
+            ]
+        )
+        return sum(selected) / len(selected) / 10 if selected else None
@@ -1 +1,4 @@
-"""Script to extract PowerView homekey from a G3 PowerView Gateway."""
+"""Scripts for PowerView shades, e.g. to extract the homekey from a G3 gateway.
+
+Run them from the repository root, e.g. python -m scripts.bench_import.
+"""
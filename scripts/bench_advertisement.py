@@ -0,0 +1,116 @@
+"""Benchmark the cached advertisement decoder against the former list decoder."""
+
+from collections.abc import Callable
+import random
+import time
+import tracemalloc
+from typing import Any, Final
+
+from custom_components.hunterdouglas_powerview_ble.pvble.advertisement import (
+    POWER_LEVELS,
+    decode_manufacturer_data,
+)
+
+
+def legacy_decoder(data: bytearray) -> list[tuple[str, float]]:
+    """Decode manufacturer data the way the API did before the record."""
+    if len(data) != 9:
+        return []
+    pos: Final[int] = int.from_bytes(data[3:5], byteorder="little")
+    pos2: Final[int] = (int(data[5]) << 4) + (int(data[4]) >> 4)
+    return [
+        ("current_position", ((pos >> 2) / 10)),
+        ("position2", pos2 >> 2),
+        ("position3", int(data[6])),
+        ("current_tilt_position", int(data[7])),
+        ("home_id", int.from_bytes(data[0:2], byteorder="little")),
+        ("type_id", int(data[2])),
+        ("is_opening", bool(pos & 0x3 == 0x2)),
+        ("is_closing", bool(pos & 0x3 == 0x1)),
+        ("battery_charging", bool(pos & 0x3 == 0x3)),
+        ("battery_level", POWER_LEVELS[(data[8] >> 6)]),
+        ("resetMode", bool(data[8] & 0x1)),
+        ("resetClock", bool(data[8] & 0x2)),
+    ]
+
+
+def adv_stream(shades: int, count: int, moving: float) -> list[bytes]:
+    """Create advertisements, shades mostly repeat their last payload."""
+    rng: Final = random.Random(2073)
+    state: list[bytearray] = [
+        bytearray(
+            (
+                0x12,
+                0x34,
+                rng.choice((1, 6, 8, 42)),
+                0,
+                0,
+                0,
+                0,
+                0,
+                rng.choice((0x80, 0xC0)),
+            )
+        )
+        for _ in range(shades)
+    ]
+    stream: list[bytes] = []
+    for _ in range(count):
+        payload: bytearray = rng.choice(state)
+        if rng.random() < moving:
+            pos: int = (rng.randrange(1001) << 2) | 0x2  # opening
+            payload[3:5] = pos.to_bytes(2, byteorder="little")
+        stream.append(bytes(payload))
+    return stream
+
+
+def measure(name: str, func: Callable[[Any], Any], stream: list[bytes]) -> None:
+    """Print CPU time and allocated memory per advertisement."""
+    decode_manufacturer_data.cache_clear()
+    start: float = time.process_time()
+    for data in stream:
+        func(data)
+    cpu: float = time.process_time() - start
+
+    decode_manufacturer_data.cache_clear()
+    tracemalloc.start()
+    results: list[Any] = [func(data) for data in stream]
+    allocated: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    print(
+        f"{name:<16} {cpu / len(stream) * 1e6:6.2f}µs, "
+        f"{allocated / len(stream):7.1f} bytes retained per advertisement"
+    )
+
+
+def main(shades: int, count: int, moving: float) -> int:
+    """Run the benchmark for a synthetic advertisement stream."""
+    stream: Final[list[bytes]] = adv_stream(shades, count, moving)
+    for data in stream[:1000]:
+        adv = decode_manufacturer_data(data)
+        if adv is None or list(adv.as_dict().items()) != legacy_decoder(
+            bytearray(data)
+        ):
+            print(f"decoder mismatch for {data.hex()}!")
+            return -1
+
+    measure("legacy decoder", lambda data: legacy_decoder(bytearray(data)), stream)
+    measure("cached decoder", decode_manufacturer_data, stream)
+    print(f"cache: {decode_manufacturer_data.cache_info()}")
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--shades", type=int, default=60, help="number of shades")
+    parser.add_argument(
+        "-c", "--count", type=int, default=100_000, help="number of advertisements"
+    )
+    parser.add_argument(
+        "-m", "--moving", type=float, default=0.02, help="share of changed payloads"
+    )
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
@@ -0,0 +1,84 @@
+"""Benchmark the frame codec against the former byte concatenation.
+
+The equivalence of both is tested in tests/test_codec.py.
+"""
+
+import timeit
+from typing import Final
+
+from custom_components.hunterdouglas_powerview_ble.pvble.codec import (
+    STOP_FRAME,
+    ShadeCmd,
+    decode_response,
+    encode_position,
+    set_seq,
+)
+
+
+def legacy_frame(cmd: ShadeCmd, seq: int, data: bytes) -> bytes:
+    """Assemble a frame the way the API did before the codec."""
+    return bytes(
+        int.to_bytes(cmd.value, 2, byteorder="little") + bytes([seq, len(data)]) + data
+    )
+
+
+def legacy_position(pos1: int, pos2: int, pos3: int, tilt: int, velocity: int) -> bytes:
+    """Assemble position data the way the API did before the codec."""
+    return (
+        int.to_bytes(pos1, 2, byteorder="little")
+        + int.to_bytes(pos2, 2, byteorder="little")
+        + int.to_bytes(pos3, 2, byteorder="little")
+        + int.to_bytes(tilt, 2, byteorder="little")
+        + int.to_bytes(velocity, 1)
+    )
+
+
+def legacy_response(data: bytes) -> tuple[int, int, int, int]:
+    """Decode a response the way the API did before the codec."""
+    return (
+        int.from_bytes(data[0:2], byteorder="little"),
+        int(data[2]),
+        int(data[3]),
+        int(data[4]),
+    )
+
+
+def main(number: int) -> int:
+    """Print the time per frame."""
+    pos: Final[tuple[int, int, int, int, int]] = (5000, 0x8000, 0x8000, 0x8000, 0)
+    resp: Final[bytes] = bytes.fromhex("e7010501 00")
+
+    def codec_round_trip() -> None:
+        frame: bytearray = encode_position(*pos)
+        set_seq(frame, 5)
+        decode_response(resp)
+
+    def legacy_round_trip() -> None:
+        legacy_frame(ShadeCmd.SET_POSITION, 5, legacy_position(*pos))
+        legacy_response(resp)
+
+    def codec_template() -> None:
+        frame: bytearray = bytearray(STOP_FRAME)
+        set_seq(frame, 5)
+
+    for name, func in (
+        ("legacy position + response", legacy_round_trip),
+        ("codec position + response", codec_round_trip),
+        ("legacy stop", lambda: legacy_frame(ShadeCmd.STOP, 5, b"")),
+        ("codec stop template", codec_template),
+    ):
+        t_run: float = timeit.timeit(func, number=number)
+        print(f"{name:<28} {t_run / number * 1e6:6.2f}µs")
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-n", "--number", type=int, default=100_000, help="benchmark iterations"
+    )
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
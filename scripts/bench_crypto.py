@@ -0,0 +1,60 @@
+"""Benchmark home key frame encryption against per-frame cipher contexts."""
+
+import os
+import timeit
+from typing import Final
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from custom_components.hunterdouglas_powerview_ble.pvble.crypto import PVCipher
+
+HOME_KEY: Final[bytes] = bytes(range(16))
+FRAMES: Final[dict[str, bytes]] = {
+    "ack (5 bytes)": bytes.fromhex("e7010301 00"),
+    "position (13 bytes)": bytes.fromhex("f7010109 b80b00800080008000"),
+    "diagnostics (34 bytes)": os.urandom(34),
+}
+
+
+def legacy_crypt(cipher: Cipher, data: bytes) -> bytes:
+    """En-/decrypt a frame the way the API did before the keystream cache."""
+    enc = cipher.encryptor()
+    return enc.update(data) + enc.finalize()
+
+
+def main(number: int) -> int:
+    """Run the benchmark and print the time per frame."""
+    cipher: Final = Cipher(algorithms.AES(HOME_KEY), modes.CTR(bytes(16)))
+    pv_cipher: Final = PVCipher(HOME_KEY)
+
+    for name, frame in FRAMES.items():
+        if legacy_crypt(cipher, frame) != pv_cipher.encrypt(frame):
+            print(f"{name}: result mismatch!")
+            return -1
+        t_legacy: float = timeit.timeit(
+            lambda frame=frame: legacy_crypt(cipher, frame), number=number
+        )
+        t_cached: float = timeit.timeit(
+            lambda frame=frame: pv_cipher.encrypt(frame), number=number
+        )
+        print(
+            f"{name:<24} per-frame context: {t_legacy / number * 1e6:7.2f}µs, "
+            f"cached keystream: {t_cached / number * 1e6:7.2f}µs "
+            f"(x{t_legacy / t_cached:.1f})"
+        )
+
+    t_setup: float = timeit.timeit(lambda: PVCipher(os.urandom(16)), number=100)
+    print(f"keystream derivation per home key: {t_setup / 100 * 1e6:.1f}µs")
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-n", "--number", type=int, default=100_000, help="iterations per frame"
+    )
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
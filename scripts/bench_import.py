@@ -0,0 +1,87 @@
+"""Benchmark the import time of the pvble library and the integration API.
+
+Every statement runs in a fresh interpreter. pvble is imported as top-level
+package from the integration directory, like by users of the library without
+Home Assistant; run from the repository root, e.g.
+python -m scripts.bench_import -n 20
+"""
+
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+from typing import Final
+
+ROOT: Final[Path] = Path(__file__).parents[1]
+INTEGRATION: Final[Path] = ROOT / "custom_components/hunterdouglas_powerview_ble"
+STATEMENTS: Final[dict[str, str]] = {
+    "import pvble": "import pvble",
+    "codec, advertisement": (
+        "from pvble.codec import encode_position\n"
+        "from pvble.advertisement import decode_manufacturer_data"
+    ),
+    "connection engine": "from pvble.api import PowerViewBLE",
+    "engine on first use": (
+        "from pvble.api import PowerViewBLE\n"
+        "import bleak, bleak_retry_connector\n"
+        "import cryptography.hazmat.primitives.ciphers"
+    ),
+    "integration API (HA)": "import custom_components.hunterdouglas_powerview_ble.api",
+}
+HEAVY: Final[tuple[str, ...]] = ("bleak", "cryptography", "homeassistant")
+CHILD: Final[str] = """
+import sys, time
+sys.path[:0] = {paths!r}
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+print(",".join(sorted({{m.split(".")[0] for m in sys.modules}} & {heavy!r})))
+"""
+
+
+def _run(statement: str) -> tuple[float, str] | None:
+    """Return import time in s and loaded heavy packages, None on failure."""
+    result: Final = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CHILD.format(
+                paths=[str(ROOT), str(INTEGRATION)],
+                statement=statement,
+                heavy=set(HEAVY),
+            ),
+        ],
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+    if result.returncode:
+        return None
+    duration, heavy = result.stdout.splitlines()
+    return float(duration), heavy
+
+
+def main(number: int) -> int:
+    """Print the median import time of each statement."""
+    print(f"median of {number} fresh interpreters")
+    for name, statement in STATEMENTS.items():
+        runs: list[tuple[float, str]] = []
+        for _ in range(number):
+            if (run := _run(statement)) is None:
+                break
+            runs.append(run)
+        if not runs:
+            print(f"{name + ':':24} skipped, not importable here")
+            continue
+        median: float = statistics.median(duration for duration, _heavy in runs)
+        print(f"{name + ':':24} {median * 1e3:8.1f}ms  loads: {runs[0][1] or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=10, help="runs")
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
@@ -0,0 +1,164 @@
+"""Benchmark the columnar FleetStore against per-shade data dictionaries.
+
+Requires Home Assistant; run from the repository root, e.g.
+python -m scripts.bench_store -s 1000
+"""
+
+from collections.abc import Callable, Mapping
+from functools import partial
+import random
+import timeit
+import tracemalloc
+from typing import Any, Final
+
+from custom_components.hunterdouglas_powerview_ble.const import ATTR_RSSI, DEADBANDS
+from custom_components.hunterdouglas_powerview_ble.pvble.advertisement import (
+    PVAdvertisement,
+    decode_manufacturer_data,
+)
+from custom_components.hunterdouglas_powerview_ble.store import FleetStore, ShadeState
+from homeassistant.components.cover import ATTR_CURRENT_POSITION
+from scripts.fake_shade import FakeShade
+
+Data = dict[str, int | float | bool]
+
+
+def _apply_sample(data: Data, sample: Data, deadbands: Mapping[str, float]) -> Data:
+    """Return new data like PVCoordinator did before the store."""
+    for key, value in sample.items():
+        old: int | float | bool | None = data.get(key)
+        if old is not None and (
+            abs(value - old) < deadbands[key] if key in deadbands else value == old
+        ):
+            sample[key] = old
+    return sample
+
+
+def _adverts(shades: int, rng: random.Random) -> list[PVAdvertisement]:
+    adverts: Final[list[PVAdvertisement]] = []
+    for _ in range(shades):
+        shade = FakeShade(
+            position=rng.randrange(0, 10001, 10), direction=rng.choice((0, 0, 0, 1, 2))
+        )
+        data = bytearray(shade.manufacturer_data())
+        data[8] = rng.randrange(4) << 6
+        adv = decode_manufacturer_data(bytes(data))
+        assert adv is not None
+        adverts.append(adv)
+    return adverts
+
+
+def _measure(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Return object and the memory allocated to build it."""
+    tracemalloc.start()
+    start: Final[int] = tracemalloc.get_traced_memory()[0]
+    obj: Final = build()
+    size: Final[int] = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return obj, size
+
+
+def _build_dicts(adverts: list[PVAdvertisement], rssi: list[int]) -> list[Data]:
+    return [{ATTR_RSSI: rssi[idx], **adv.as_dict()} for idx, adv in enumerate(adverts)]
+
+
+def _build_store(adverts: list[PVAdvertisement], rssi: list[int]) -> FleetStore:
+    store: Final[FleetStore] = FleetStore()
+    for idx, adv in enumerate(adverts):
+        store.update(store.add(f"shade{idx}"), rssi[idx], adv, DEADBANDS)
+    return store
+
+
+def _dicts_moving(dicts: list[Data]) -> list[int]:
+    return [
+        idx
+        for idx, data in enumerate(dicts)
+        if data.get("is_opening") or data.get("is_closing")
+    ]
+
+
+def _dicts_low_battery(dicts: list[Data]) -> list[int]:
+    return [
+        idx for idx, data in enumerate(dicts) if data.get("battery_level", 100) <= 20
+    ]
+
+
+def _dicts_mean_position(dicts: list[Data]) -> float:
+    return sum(data[ATTR_CURRENT_POSITION] for data in dicts) / len(dicts)
+
+
+def _read_positions(data: list[Data] | list[ShadeState]) -> float:
+    return sum(shade[ATTR_CURRENT_POSITION] for shade in data)
+
+
+def main(shades: int, number: int) -> int:
+    """Compare memory, update and query times of both representations."""
+    rng: Final[random.Random] = random.Random(2073)
+    adverts: Final[list[PVAdvertisement]] = _adverts(shades, rng)
+    moved: Final[list[PVAdvertisement]] = _adverts(shades, rng)
+    rssi: Final[list[int]] = [rng.randint(-90, -50) for _ in range(shades)]
+
+    dicts, dict_mem = _measure(partial(_build_dicts, adverts, rssi))
+    store, store_mem = _measure(partial(_build_store, adverts, rssi))
+    views: Final[list[ShadeState]] = [store.view(slot) for slot in range(shades)]
+
+    def _update_dicts(updates: list[PVAdvertisement]) -> None:
+        for idx, adv in enumerate(updates):
+            dicts[idx] = _apply_sample(
+                dicts[idx], {ATTR_RSSI: rssi[idx], **adv.as_dict()}, DEADBANDS
+            )
+
+    def _update_store(updates: list[PVAdvertisement]) -> None:
+        for idx, adv in enumerate(updates):
+            store.update(idx, rssi[idx], adv, DEADBANDS)
+
+    def _move_dicts() -> None:
+        _update_dicts(moved)
+        _update_dicts(adverts)
+
+    def _move_store() -> None:
+        _update_store(moved)
+        _update_store(adverts)
+
+    assert len(_dicts_moving(dicts)) == len(store.moving())
+    assert len(_dicts_low_battery(dicts)) == len(store.low_battery())
+    assert round(_dicts_mean_position(dicts), 3) == round(store.mean_position() or 0, 3)
+
+    print(f"{shades} shades, times per call over {number} runs")
+    print(
+        f"memory per shade: dicts {dict_mem / shades:8.0f}B, store {store_mem / shades:8.0f}B"
+    )
+    for name, dict_fn, store_fn in (
+        (
+            "repeated adverts",
+            partial(_update_dicts, adverts),
+            partial(_update_store, adverts),
+        ),
+        ("changed adverts", _move_dicts, _move_store),
+        ("moving", partial(_dicts_moving, dicts), store.moving),
+        ("low battery", partial(_dicts_low_battery, dicts), store.low_battery),
+        ("mean position", partial(_dicts_mean_position, dicts), store.mean_position),
+        (
+            "entity reads",
+            partial(_read_positions, dicts),
+            partial(_read_positions, views),
+        ),
+    ):
+        dict_time = timeit.timeit(dict_fn, number=number) / number
+        store_time = timeit.timeit(store_fn, number=number) / number
+        print(
+            f"{name + ':':18} dicts {dict_time * 1e6:8.1f}µs, "
+            f"store {store_time * 1e6:8.1f}µs"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--shades", type=int, default=1000, help="shades")
+    parser.add_argument("-n", "--number", type=int, default=100, help="runs per test")
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
@@ -0,0 +1,264 @@
+"""In-memory PowerView shade emulating the GATT surface of emu/PV_BLE_cover.
+
+FakeBleakClient can be passed as client_class to PowerViewBLE, so that the
+complete command path incl. establish_connection runs without Bluetooth.
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import random
+import time
+from typing import Any, Final
+
+from bleak.backends.device import BLEDevice
+from bleak.exc import BleakError
+
+from custom_components.hunterdouglas_powerview_ble.pvble.api import (
+    UUID_TX,
+    PowerViewBLE,
+)
+from custom_components.hunterdouglas_powerview_ble.pvble.codec import (
+    HEADER,
+    POSITION,
+    RESPONSE_MASK,
+    ShadeCmd,
+)
+from custom_components.hunterdouglas_powerview_ble.pvble.const import MFCT_ID
+from custom_components.hunterdouglas_powerview_ble.pvble.crypto import PVCipher
+
+BAT_CHAR: Final[str] = "00002a19-0000-1000-8000-00805f9b34fb"
+
+
+def _char_uuid(short: str) -> str:
+    return f"0000{short}-0000-1000-8000-00805f9b34fb"
+
+
+@dataclass
+class FakeShade:
+    """State and behaviour of an emulated shade."""
+
+    address: str = "AA:BB:CC:DD:EE:FF"
+    name: str = "myPVcover"
+    home_key: bytes = b""
+    type_id: int = 42
+    serial_nr: str = "01234567890ABCDEF"
+    sw_rev: int = 391
+    fw_rev: int = 27
+    hw_rev: int = 171103
+    battery_level: int = 42
+    # the sketch only acknowledges identify, real shades confirm all commands
+    ack_motion: bool = True
+    errors: dict[int, int] = field(default_factory=dict)  # command -> error code
+    latency: float = 0.03  # s from write to notification
+    connect_latency: float = 0.2  # s
+    loss: float = 0.0  # probability a written frame is lost
+    seed: int | None = None
+    position: int = 0  # 0.01%
+    tilt: int = 0
+    direction: int = 0  # advertised motion, 1: closing, 2: opening
+    frames: list[bytes] = field(default_factory=list)  # decrypted frames received
+
+    def __post_init__(self) -> None:
+        """Initialize cipher and random source."""
+        self._cipher: PVCipher | None = (
+            PVCipher(self.home_key) if any(self.home_key) else None
+        )
+        self._rng: random.Random = random.Random(self.seed)
+
+    @property
+    def home_id(self) -> int:
+        """Return the home ID advertised when a key is set."""
+        return 0x1234 if self._cipher is not None else 0
+
+    @property
+    def gatt(self) -> dict[str, bytes]:
+        """Return the readable characteristics of the sketch."""
+        return {
+            _char_uuid("2a29"): b"Hunter Douglas",
+            _char_uuid("2a24"): str(self.type_id).encode(),
+            _char_uuid("2a25"): self.serial_nr.encode(),
+            _char_uuid("2a27"): str(self.hw_rev).encode(),
+            _char_uuid("2a26"): str(self.fw_rev).encode(),
+            _char_uuid("2a28"): str(self.sw_rev).encode(),
+            BAT_CHAR: bytes([self.battery_level]),
+        }
+
+    def manufacturer_data(self) -> bytes:
+        """Return a V2 advertisement payload of the current state."""
+        return (
+            self.home_id.to_bytes(2, byteorder="little")
+            + bytes([self.type_id])
+            + ((self.position // 10) << 2 | self.direction).to_bytes(
+                2, byteorder="little"
+            )
+            + bytes([0, 0, self.tilt & 0xFF, 0xC0])
+        )
+
+    def advertisement(self) -> dict[int, bytes]:
+        """Return the manufacturer data of an advertisement."""
+        return {MFCT_ID: self.manufacturer_data()}
+
+    def ble_device(self, source: str = "fake0") -> BLEDevice:
+        """Return a device reached via the adapter source."""
+        return BLEDevice(self.address, self.name, {"source": source, "shade": self})
+
+    def lost(self) -> bool:
+        """Return whether a frame gets lost."""
+        return self._rng.random() < self.loss
+
+    def handle(self, data: bytes) -> bytes | None:
+        """Process a written frame, return the (encrypted) notification."""
+        if len(data) < HEADER.size:
+            return None
+        frame: Final[bytes] = self._cipher.decrypt(data) if self._cipher else data
+        self.frames.append(frame)
+        cmd, seq, data_len = HEADER.unpack_from(frame)
+        if cmd == ShadeCmd.SET_POSITION.value and data_len >= POSITION.size:
+            pos1, _pos2, _pos3, tilt, _velocity = POSITION.unpack_from(
+                frame, HEADER.size
+            )
+            self.position = min(pos1, 10000)
+            if tilt != 0x8000:
+                self.tilt = tilt
+        if not self.ack_motion and cmd in (
+            ShadeCmd.SET_POSITION.value,
+            ShadeCmd.STOP.value,
+            ShadeCmd.ACTIVATE_SCENE.value,
+        ):
+            return None
+        response: Final[bytes] = HEADER.pack(cmd & RESPONSE_MASK, seq, 1) + bytes(
+            [self.errors.get(cmd, 0)]
+        )
+        return self._cipher.encrypt(response) if self._cipher else response
+
+
+class FakeBleakClient:
+    """Client for a FakeShade, accepted by establish_connection."""
+
+    def __init__(
+        self,
+        address_or_ble_device: BLEDevice | str,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        **_kwargs: Any,
+    ) -> None:
+        """Initialize client, the shade is taken from the device details."""
+        if not isinstance(address_or_ble_device, BLEDevice):
+            raise BleakError("FakeBleakClient needs a device from FakeShade")
+        self._device: Final[BLEDevice] = address_or_ble_device
+        self._shade: Final[FakeShade] = address_or_ble_device.details["shade"]
+        self._disconnected_callback: Final = disconnected_callback
+        self._notify: Callable[[Any, bytearray], None] | None = None
+        self._connected: bool = False
+        self.address: Final[str] = address_or_ble_device.address
+
+    @property
+    def is_connected(self) -> bool:
+        """Return whether the client is connected."""
+        return self._connected
+
+    async def connect(self, **_kwargs: Any) -> bool:
+        """Connect after the configured latency."""
+        await asyncio.sleep(self._shade.connect_latency)
+        self._connected = True
+        return True
+
+    async def disconnect(self) -> bool:
+        """Disconnect and call back like bleak does."""
+        if self._connected:
+            self._connected = False
+            if self._disconnected_callback is not None:
+                self._disconnected_callback(self)
+        return True
+
+    async def start_notify(
+        self, char: str, callback: Callable[[Any, bytearray], None], **_kwargs: Any
+    ) -> None:
+        """Register the notification handler of the cover characteristic."""
+        self._check(char)
+        self._notify = callback
+
+    async def read_gatt_char(self, char: str, **_kwargs: Any) -> bytearray:
+        """Read a device information characteristic."""
+        self._check(char)
+        if (value := self._shade.gatt.get(char.lower())) is None:
+            raise BleakError(f"Characteristic {char} was not found!")
+        return bytearray(value)
+
+    async def write_gatt_char(
+        self, char: str, data: bytes | bytearray, response: bool = False
+    ) -> None:
+        """Write to the cover characteristic, the shade may lose the frame."""
+        self._check(char)
+        if char.lower() != UUID_TX:
+            raise BleakError(f"Characteristic {char} is not writable!")
+        if self._shade.lost():
+            return
+        if (notification := self._shade.handle(bytes(data))) is not None:
+            asyncio.get_running_loop().call_later(
+                self._shade.latency, self._deliver, notification
+            )
+
+    def _deliver(self, notification: bytes) -> None:
+        if self._connected and self._notify is not None:
+            self._notify(None, bytearray(notification))
+
+    def _check(self, char: str) -> None:
+        if not self._connected:
+            raise BleakError(f"Not connected, cannot access {char}")
+
+
+async def run(number: int, latency: float, loss: float, key: bool) -> int:
+    """Send commands to a fake shade and print link statistics."""
+    shade: Final[FakeShade] = FakeShade(
+        home_key=bytes(range(16)) if key else b"", latency=latency, loss=loss, seed=1
+    )
+    api: Final[PowerViewBLE] = PowerViewBLE(
+        shade.ble_device(),
+        shade.home_key,
+        client_class=FakeBleakClient,  # type: ignore[arg-type]
+    )
+    adv = api.dec_manufacturer_data(shade.manufacturer_data())
+    api.encrypted = adv is not None and bool(adv.home_id)
+    info: Final[dict[str, str]] = await api.query_dev_info()
+    print(f"device info: {info}")
+
+    failed: int = 0
+    start: Final[float] = time.monotonic()
+    for idx in range(number):
+        try:
+            failed += not await api.set_position(idx % 101)
+        except TimeoutError:
+            failed += 1
+    duration: Final[float] = time.monotonic() - start
+    await api.disconnect()
+
+    print(f"{number} commands in {duration:.2f}s, {failed} failed")
+    print(f"link: {api.stats}")
+    print(f"rtt: {api.rto}")
+    print(f"write->ack: {api.metrics.write_ack.as_dict()}")
+    return 1 if failed else 0
+
+
+def main(number: int, latency: float, loss: float, key: bool) -> int:
+    """Run commands against the fake shade."""
+    return asyncio.run(run(number, latency, loss, key))
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=50, help="commands")
+    parser.add_argument(
+        "-l", "--latency", type=float, default=0.03, help="ack latency in s"
+    )
+    parser.add_argument(
+        "-p", "--loss", type=float, default=0.0, help="probability of a lost frame"
+    )
+    parser.add_argument(
+        "-k", "--key", action="store_true", help="encrypt with a test home key"
+    )
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
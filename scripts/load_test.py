@@ -0,0 +1,205 @@
+"""Load test of advertisement dispatching and handling for a fleet of shades.
+
+Requires Home Assistant; run from the repository root, e.g.
+python -m scripts.load_test -s 100 -r 2 -d 30
+"""
+
+import asyncio
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Final
+
+from bleak.backends.scanner import AdvertisementData
+
+from custom_components.hunterdouglas_powerview_ble.const import ATTR_RSSI
+from custom_components.hunterdouglas_powerview_ble.coordinator import PVCoordinator
+from custom_components.hunterdouglas_powerview_ble.cover import UPDATE_KEYS
+from custom_components.hunterdouglas_powerview_ble.dispatcher import PVDispatcher
+from custom_components.hunterdouglas_powerview_ble.pvble.metrics import Histogram
+from homeassistant.components.bluetooth import (
+    BluetoothChange,
+    BluetoothServiceInfoBleak,
+)
+from homeassistant.const import ATTR_BATTERY_LEVEL
+from homeassistant.core import HomeAssistant
+from scripts.fake_shade import FakeShade
+
+LAG_INTERVAL: Final[float] = 0.05  # s between event loop lag probes
+FEED_INTERVAL: Final[float] = 0.01  # s between advertisement batches
+SERVICE_UUID: Final[str] = "0000fdc1-0000-1000-8000-00805f9b34fb"
+# listener contexts of the entities the platforms create per shade
+ENTITY_CONTEXTS: Final[tuple[frozenset[str], ...]] = (
+    UPDATE_KEYS,
+    frozenset({ATTR_BATTERY_LEVEL}),
+    frozenset({ATTR_RSSI}),
+    frozenset({"battery_charging"}),
+)
+
+
+@dataclass
+class FakeEntry:
+    """Minimal config entry as seen by PVCoordinator."""
+
+    hass: HomeAssistant
+    entry_id: str
+    data: dict[str, Any] = field(default_factory=dict)
+    options: dict[str, Any] = field(default_factory=dict)
+
+    def async_create_background_task(
+        self, hass: HomeAssistant, target: Coroutine[Any, Any, Any], name: str
+    ) -> asyncio.Task[Any]:
+        """Create a task like ConfigEntry does."""
+        return hass.async_create_background_task(target, name)
+
+
+class FleetShade:
+    """Fake shade producing realistic advertisement change patterns."""
+
+    def __init__(self, idx: int, rng: random.Random) -> None:
+        """Initialize a shade at a random position."""
+        self.rng: Final[random.Random] = rng
+        self.shade: Final[FakeShade] = FakeShade(
+            address=f"AA:BB:CC:{idx >> 16 & 0xFF:02X}:{idx >> 8 & 0xFF:02X}:{idx & 0xFF:02X}",
+            name=f"shade{idx:04d}",
+            position=rng.randrange(0, 10001, 100),
+        )
+        self.target: int = self.shade.position
+        self.rssi: float = rng.uniform(-90, -50)
+        self.device: Final = self.shade.ble_device(f"proxy{idx % 4}")
+
+    def advertise(self, moving: float) -> BluetoothServiceInfoBleak:
+        """Return the next advertisement, shades start to move with p=moving."""
+        shade: Final[FakeShade] = self.shade
+        if shade.position == self.target and self.rng.random() < moving:
+            self.target = self.rng.randrange(0, 10001, 100)
+        if shade.position != self.target:  # about 1%/advertisement while moving
+            step: int = max(-100, min(100, self.target - shade.position))
+            shade.position += step
+            shade.direction = 2 if step > 0 else 1
+        else:
+            shade.direction = 0
+        rssi: Final[int] = round(self.rssi + self.rng.gauss(0, 2))
+        return BluetoothServiceInfoBleak.from_device_and_advertisement_data(
+            self.device,
+            AdvertisementData(
+                local_name=shade.name,
+                manufacturer_data=shade.advertisement(),
+                service_data={},
+                service_uuids=[SERVICE_UUID],
+                tx_power=None,
+                rssi=rssi,
+                platform_data=(),
+            ),
+            self.device.details["source"],
+            time.monotonic(),
+            True,
+        )
+
+
+async def _probe_lag(lag: Histogram, stop: asyncio.Event) -> None:
+    """Measure how late the event loop wakes up a sleeping task."""
+    loop: Final = asyncio.get_running_loop()
+    while not stop.is_set():
+        start: float = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        lag.record(max(loop.time() - start - LAG_INTERVAL, 0))
+
+
+async def run(shades: int, rate: float, duration: float, moving: float) -> int:
+    """Feed advertisements to the coordinators and print the results."""
+    rng: Final[random.Random] = random.Random(2073)
+    hass: Final[HomeAssistant] = HomeAssistant(tempfile.mkdtemp())
+    fleet: Final[list[FleetShade]] = [FleetShade(idx, rng) for idx in range(shades)]
+    writes: list[int] = [0]
+
+    def _write() -> None:
+        writes[0] += 1
+
+    tracemalloc.start()
+    mem_start: Final[int] = tracemalloc.get_traced_memory()[0]
+    coordinators: Final[list[PVCoordinator]] = []
+    dispatcher: Final[PVDispatcher] = PVDispatcher(hass)
+    for idx, fleet_shade in enumerate(fleet):
+        entry = FakeEntry(
+            hass,
+            f"entry{idx}",
+            {"manufacturer_data": fleet_shade.shade.manufacturer_data().hex()},
+        )
+        coordinator = PVCoordinator(hass, fleet_shade.device, entry)  # type: ignore[arg-type]
+        for context in ENTITY_CONTEXTS:
+            coordinator.async_add_listener(_write, context)
+        dispatcher.add_route(coordinator, fleet_shade.shade.home_id)
+        coordinators.append(coordinator)
+    mem_shade: Final[float] = (tracemalloc.get_traced_memory()[0] - mem_start) / shades
+    tracemalloc.stop()
+
+    lag: Final[Histogram] = Histogram()
+    stop: Final[asyncio.Event] = asyncio.Event()
+    probe: Final = asyncio.create_task(_probe_lag(lag, stop))
+    adverts: int = 0
+    cpu: float = 0.0
+    loop: Final = asyncio.get_running_loop()
+    start: Final[float] = loop.time()
+    due: float = 0.0
+    while (now := loop.time()) - start < duration:
+        due += shades * rate * FEED_INTERVAL
+        batch: list[BluetoothServiceInfoBleak] = []
+        while due >= 1:
+            batch.append(fleet[rng.randrange(shades)].advertise(moving))
+            due -= 1
+        cpu_start: float = time.process_time()
+        for service_info in batch:
+            dispatcher.async_dispatch(service_info, BluetoothChange.ADVERTISEMENT)
+        cpu += time.process_time() - cpu_start
+        adverts += len(batch)
+        await asyncio.sleep(max(0, FEED_INTERVAL - (loop.time() - now)))
+    elapsed: Final[float] = loop.time() - start
+    stop.set()
+    await probe
+
+    suppressed: Final[int] = sum(c.update_stats.suppressed for c in coordinators)
+    print(f"{shades} shades, {adverts} advertisements in {elapsed:.1f}s")
+    print(f"CPU per advertisement:  {cpu / max(adverts, 1) * 1e6:8.2f}µs")
+    print(f"entity state writes/s:  {writes[0] / elapsed:8.1f}")
+    print(f"suppressed updates:     {suppressed / max(adverts, 1):8.1%}")
+    print(f"memory per shade:       {mem_shade / 1024:8.1f}kB")
+    print(f"event loop lag:         {lag.as_dict()}")
+    print(f"dispatcher:             {dispatcher.stats}")
+    await hass.async_stop(force=True)
+    return 0
+
+
+def main(shades: int, rate: float, duration: float, moving: float) -> int:
+    """Run the load test."""
+    return asyncio.run(run(shades, rate, duration, moving))
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-s", "--shades", type=int, default=100, help="number of shades (10-1000)"
+    )
+    parser.add_argument(
+        "-r", "--rate", type=float, default=1.0, help="advertisements/s per shade"
+    )
+    parser.add_argument(
+        "-d", "--duration", type=float, default=30.0, help="test duration in s"
+    )
+    parser.add_argument(
+        "-m",
+        "--moving",
+        type=float,
+        default=0.002,
+        help="probability an idle shade starts moving per advertisement",
+    )
+    args = parser.parse_args()
+    if not 10 <= args.shades <= 1000:
+        parser.error("number of shades must be within 10..1000")
+    sys.exit(main(**vars(args)))
@@ -0,0 +1,114 @@
+"""Replay an advertisement capture into PVCoordinator instances.
+
+Requires Home Assistant; run from the repository root, e.g.
+python -m scripts.replay_capture hunterdouglas_powerview_ble.pvcap -s 10
+"""
+
+import asyncio
+from pathlib import Path
+import tempfile
+import time
+from typing import Final
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+
+from custom_components.hunterdouglas_powerview_ble.capture import (
+    CaptureReader,
+    CaptureRecord,
+    replay,
+)
+from custom_components.hunterdouglas_powerview_ble.coordinator import PVCoordinator
+from custom_components.hunterdouglas_powerview_ble.dispatcher import PVDispatcher
+from custom_components.hunterdouglas_powerview_ble.pvble.advertisement import (
+    decode_manufacturer_data,
+)
+from custom_components.hunterdouglas_powerview_ble.pvble.const import MFCT_ID
+from homeassistant.components.bluetooth import (
+    BluetoothChange,
+    BluetoothServiceInfoBleak,
+)
+from homeassistant.core import HomeAssistant
+from scripts.load_test import SERVICE_UUID, FakeEntry
+
+
+async def run(capture: Path, speed: float) -> int:
+    """Replay the capture and print coordinator statistics."""
+    hass: Final[HomeAssistant] = HomeAssistant(tempfile.mkdtemp())
+    coordinators: Final[dict[str, PVCoordinator]] = {}
+    dispatcher: Final[PVDispatcher] = PVDispatcher(hass)
+
+    def _handle(record: CaptureRecord) -> None:
+        device = BLEDevice(record.address, record.address, {"source": record.source})
+        if (coordinator := coordinators.get(record.address)) is None:
+            coordinator = coordinators[record.address] = PVCoordinator(
+                hass,
+                device,
+                FakeEntry(  # type: ignore[arg-type]
+                    hass, record.address, {"manufacturer_data": record.payload.hex()}
+                ),
+            )
+            dispatcher.add_route(coordinator, coordinator.home_id)
+        dispatcher.async_dispatch(
+            BluetoothServiceInfoBleak.from_device_and_advertisement_data(
+                device,
+                AdvertisementData(
+                    local_name=None,
+                    manufacturer_data={MFCT_ID: record.payload},
+                    service_data={},
+                    service_uuids=[SERVICE_UUID],
+                    tx_power=None,
+                    rssi=record.rssi,
+                    platform_data=(),
+                ),
+                record.source,
+                time.monotonic(),
+                True,
+            ),
+            BluetoothChange.ADVERTISEMENT,
+        )
+
+    with CaptureReader(capture) as records:
+        if not len(records):
+            print(f"{capture} contains no advertisements")
+            return 1
+        span: Final[float] = records[-1].timestamp - records[0].timestamp
+        start: Final[float] = time.monotonic()
+        count: Final[int] = await replay(records, _handle, speed)
+        elapsed: Final[float] = time.monotonic() - start
+
+    print(
+        f"{count} advertisements of {len(coordinators)} shades, "
+        f"captured in {span:.1f}s, replayed in {elapsed:.1f}s"
+    )
+    for address, coordinator in sorted(coordinators.items()):
+        print(
+            f"{address}: {coordinator.update_stats}, "
+            f"position {coordinator.data.get('current_position')}"
+        )
+    print(f"dispatcher: {dispatcher.stats}")
+    print(f"decoder cache: {decode_manufacturer_data.cache_info()}")
+    await hass.async_stop(force=True)
+    return 0
+
+
+def main(capture: Path, speed: float) -> int:
+    """Replay a capture file."""
+    return asyncio.run(run(capture, speed))
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("capture", type=Path, help="capture file")
+    parser.add_argument(
+        "-s",
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed factor, 0 replays as fast as possible",
+    )
+    args = parser.parse_args()
+    sys.exit(main(**vars(args)))
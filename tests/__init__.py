@@ -0,0 +1 @@
+"""Tests for the Hunter Douglas PowerView (BLE) integration."""
@@ -0,0 +1,116 @@
+"""Test the frame codec of the pvble protocol library."""
+
+import random
+import struct
+from typing import Final
+
+import pytest
+
+from custom_components.hunterdouglas_powerview_ble.pvble.codec import (
+    CLOSE_FRAME,
+    HEADER,
+    IDENTIFY,
+    IDENTIFY_FRAME,
+    OPEN_FRAME,
+    POS_UNCHANGED,
+    POSITION,
+    RESPONSE,
+    SCENE,
+    STOP_FRAME,
+    PVResponse,
+    ShadeCmd,
+    decode_response,
+    encode_identify,
+    encode_position,
+    encode_scene,
+    set_seq,
+)
+
+_RNG: Final[random.Random] = random.Random(2073)
+POSITIONS: Final[list[tuple[int, int, int, int, int]]] = [
+    (
+        _RNG.randrange(10001),
+        _RNG.randrange(0x10000),
+        _RNG.randrange(0x10000),
+        _RNG.randrange(0x10000),
+        _RNG.randrange(0x100),
+    )
+    for _ in range(100)
+]
+RESPONSES: Final[list[bytes]] = [
+    _RNG.randbytes(RESPONSE.size + _RNG.randrange(4)) for _ in range(100)
+]
+
+
+def legacy_frame(cmd: ShadeCmd, seq: int, data: bytes) -> bytes:
+    """Assemble a frame the way the API did before the codec."""
+    return (
+        int.to_bytes(cmd.value, 2, byteorder="little") + bytes([seq, len(data)]) + data
+    )
+
+
+@pytest.mark.parametrize("position", POSITIONS)
+@pytest.mark.parametrize("seq", [0, 1, 0x7F, 0xFF])
+def test_position_round_trip(
+    position: tuple[int, int, int, int, int], seq: int
+) -> None:
+    """Test that a position frame decodes to its header and values."""
+    frame: Final[bytearray] = encode_position(*position)
+    set_seq(frame, seq)
+    assert HEADER.unpack_from(frame) == (
+        ShadeCmd.SET_POSITION.value,
+        seq,
+        POSITION.size,
+    )
+    assert POSITION.unpack_from(frame, HEADER.size) == position
+    assert frame == legacy_frame(
+        ShadeCmd.SET_POSITION,
+        seq,
+        b"".join(value.to_bytes(2, byteorder="little") for value in position[:4])
+        + bytes([position[4]]),
+    )
+
+
+@pytest.mark.parametrize("idx", [0, 1, 0xFF])
+def test_scene(idx: int) -> None:
+    """Test the activate scene frame."""
+    frame: Final[bytearray] = encode_scene(idx)
+    assert HEADER.unpack_from(frame) == (ShadeCmd.ACTIVATE_SCENE.value, 0, SCENE.size)
+    assert SCENE.unpack_from(frame, HEADER.size) == (idx, 0xA2)
+
+
+@pytest.mark.parametrize(("beeps", "expected"), [(0, 0), (3, 3), (0x1FF, 0xFF)])
+def test_identify(beeps: int, expected: int) -> None:
+    """Test that the identify frame limits the number of beeps to one byte."""
+    frame: Final[bytearray] = encode_identify(beeps)
+    assert HEADER.unpack_from(frame) == (ShadeCmd.IDENTIFY.value, 0, IDENTIFY.size)
+    assert IDENTIFY.unpack_from(frame, HEADER.size) == (expected,)
+
+
+def test_templates() -> None:
+    """Test that the pre-encoded frames match the encoders."""
+    assert legacy_frame(ShadeCmd.STOP, 0, b"") == STOP_FRAME
+    assert bytes(encode_identify(3)) == IDENTIFY_FRAME
+    assert bytes(encode_position(10000)) == OPEN_FRAME
+    assert bytes(encode_position(0)) == CLOSE_FRAME
+    assert POSITION.unpack_from(OPEN_FRAME, HEADER.size)[1:4] == (POS_UNCHANGED,) * 3
+
+
+@pytest.mark.parametrize("data", RESPONSES)
+def test_response_round_trip(data: bytes) -> None:
+    """Test that a response decodes to its fields and encodes back to its header."""
+    response: Final[PVResponse] = decode_response(data)
+    assert response == (
+        int.from_bytes(data[0:2], byteorder="little"),
+        data[2],
+        data[3],
+        data[4],
+    )
+    assert RESPONSE.pack(*response) == data[: RESPONSE.size]
+    assert decode_response(memoryview(bytearray(data))) == response
+
+
+def test_response_too_short() -> None:
+    """Test that a truncated response is rejected."""
+    with pytest.raises(struct.error):
+        decode_response(bytes(RESPONSE.size - 1))